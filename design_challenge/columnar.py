@@ -0,0 +1,146 @@
+"""A compact, column-per-field store for cart items, handing out Item-like views."""
+from array import array
+from decimal import Decimal
+from itertools import repeat
+from operator import mul
+from typing import Iterable, Iterator, Protocol
+
+from design_challenge.day6.after_tomaluuk import TrackedLine
+from design_challenge.money import Money
+
+
+class Line(Protocol):
+    name: str
+    price: Decimal | Money
+    quantity: int
+
+
+class ItemView(TrackedLine):
+    """One row of a `ColumnarItems` store, read and written through like an `Item`.
+
+    A view refers to its row by position; the store hands out one view per row and
+    keeps it pointing at its row as rows before it are removed. Views support the
+    day 6 cart's `set_quantity` and `set_price`, so such a cart can hold them.
+    """
+
+    __slots__ = ("_store", "_index", "_price", "_owners")
+
+    def __init__(self, store: "ColumnarItems", index: int) -> None:
+        self._store = store
+        self._index = index
+        self._price: Money | None = None
+        self._owners: tuple = ()
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._index]
+
+    @property
+    def price(self) -> Money:
+        # The same Money while the price is unchanged, so renderers can tell by identity.
+        cents = self._store.cents[self._index]
+        price = self._price
+        if price is None or price.cents != cents:
+            price = self._price = Money(cents)
+        return price
+
+    @price.setter
+    def price(self, price: Decimal | Money) -> None:
+        self._store.cents[self._index] = _to_cents(price)
+
+    @property
+    def quantity(self) -> int:
+        return self._store.quantities[self._index]
+
+    @quantity.setter
+    def quantity(self, quantity: int) -> None:
+        self._store.quantities[self._index] = quantity
+
+    @property
+    def subtotal(self) -> Money:
+        store, index = self._store, self._index
+        return Money(store.cents[index] * store.quantities[index])
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            return (
+                self.name == other.name
+                and self.price == other.price
+                and self.quantity == other.quantity
+            )
+        except AttributeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ItemView(name={self.name!r}, price={self.price!r}, quantity={self.quantity!r})"
+
+
+def _to_cents(price: Decimal | Money) -> int:
+    return price.cents if isinstance(price, Money) else Money.from_decimal(price).cents
+
+
+class ColumnarItems:
+    """Cart items stored as a list of names and arrays of integer cents and quantities.
+
+    Supports what carts do with their item lists: `append`, iterating, indexing,
+    `len` and `remove` (which takes O(n), like `list.remove`). Items iterate as
+    `ItemView`s with Money prices. Appended prices must be whole cents; see
+    `Money.from_decimal`. Views are created on first access to their row and
+    then kept, so each row has a single view.
+    """
+
+    def __init__(self, items: Iterable[Line] = ()) -> None:
+        self.names: list[str] = []
+        self.cents = array("q")
+        self.quantities = array("q")
+        # The view of each row handed out so far, or None; may be shorter than the store.
+        self._views: list[ItemView | None] = []
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[ItemView]:
+        return map(self._view, range(len(self.names)))
+
+    def __getitem__(self, index: int) -> ItemView:
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError("ColumnarItems index out of range")
+        return self._view(index)
+
+    def append(self, item: Line) -> None:
+        cents = _to_cents(item.price)
+        self.quantities.append(item.quantity)
+        self.cents.append(cents)
+        self.names.append(item.name)
+
+    def remove(self, item: Line) -> None:
+        """Remove the first row equal to `item`, like `list.remove`."""
+        for index, view in enumerate(self):
+            if view == item:
+                del self.names[index]
+                del self.cents[index]
+                del self.quantities[index]
+                views = self._views
+                del views[index]
+                for later in range(index, len(views)):
+                    if views[later] is not None:
+                        views[later]._index = later
+                return
+        raise ValueError(f"{item} is not in the store.")
+
+    def total_price(self) -> Money:
+        """Sum of price times quantity over all rows, without creating a view per row."""
+        return Money(sum(map(mul, self.cents, self.quantities)))
+
+    def _view(self, index: int) -> ItemView:
+        views = self._views
+        if index >= len(views):
+            views.extend(repeat(None, index + 1 - len(views)))
+        view = views[index]
+        if view is None:
+            view = views[index] = ItemView(self, index)
+        return view
@@ -1,12 +1,103 @@
 """A module for day 1 submission: using the KISS principle."""
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
 
-def count_fruits(fruits: list[str]) -> dict[str, int]:
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+@dataclass
+class Categorical:
+    """Integer-coded labels: `codes[i]` is the index of the i-th label in `vocabulary`."""
+
+    vocabulary: list[str]
+    codes: Any  # array.array of unsigned ints or an integer NumPy array
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> "Categorical":
+        """Encode `labels`, numbering the vocabulary in order of first appearance."""
+        index: dict[str, int] = {}
+        codes = array("I", [index.setdefault(label, len(index)) for label in labels])
+        if np is not None:
+            codes = np.frombuffer(codes, dtype=np.uintc)
+        return cls(vocabulary=list(index), codes=codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def count_categorical(fruits: Categorical) -> dict[str, int]:
+    """Count integer-coded fruits and decode the result back to fruit names."""
+    if np is not None:
+        counts = np.bincount(np.asarray(fruits.codes), minlength=len(fruits.vocabulary)).tolist()
+    else:
+        code_counts = Counter(fruits.codes)
+        counts = [code_counts[code] for code in range(len(fruits.vocabulary))]
+
+    return {fruit: count for fruit, count in zip(fruits.vocabulary, counts) if count}
+
+
+def count_fruits(fruits: list[str] | Categorical) -> dict[str, int]:
     """Count the number of unique fruits in the input list `fruits`."""
 
+    if isinstance(fruits, Categorical):
+        return count_categorical(fruits)
+
     if len(fruits) == 0:
         return {}
 
-    dict_counts = {fruit: fruits.count(fruit) for fruit in fruits}
+    # Counter counts in a single pass, unlike calling `fruits.count` per element.
+    dict_counts = dict(Counter(fruits))
 
     return dict_counts
+
+
+def _iter_labels(source: Iterable[str] | IO[str]) -> Iterator[str]:
+    """Yield labels from an iterable, or one label per non-empty line of a file-like object."""
+    if hasattr(source, "readline"):
+        for line in source:
+            label = line.strip()
+            if label:
+                yield label
+    else:
+        yield from source
+
+
+def count_fruits_stream(source: Iterable[str] | IO[str]) -> dict[str, int]:
+    """Count fruits from any iterable or file-like `source` without materializing it."""
+    counts: Counter[str] = Counter()
+    counts.update(_iter_labels(source))
+    return dict(counts)
+
+
+def _chunks(labels: Iterator[str], chunk_size: int) -> Iterator[list[str]]:
+    while chunk := list(islice(labels, chunk_size)):
+        yield chunk
+
+
+def _count_chunk(chunk: list[str]) -> Counter[str]:
+    return Counter(chunk)
+
+
+def count_fruits_parallel(
+    source: Iterable[str] | IO[str],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, int]:
+    """Count fruits in chunks of `chunk_size` on a process pool and merge the partial counts."""
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    counts: Counter[str] = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_count_chunk, _chunks(_iter_labels(source), chunk_size)):
+            counts.update(partial)
+    return dict(counts)
@@ -0,0 +1,64 @@
+"""Benchmark count_fruits scaling from 10^3 to 10^7 items."""
+import random
+import time
+from typing import Callable
+
+from design_challenge.day1.after_tomaluuk import (
+    Categorical,
+    count_fruits,
+    count_fruits_parallel,
+    count_fruits_stream,
+)
+
+FRUITS = ["apple", "banana", "cherry", "durian", "elderberry", "fig", "grape", "honeydew"]
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+CATEGORICAL_SIZE = 10**7
+# The quadratic version is only timed for sizes it finishes in reasonable time.
+QUADRATIC_MAX_SIZE = 10**4
+
+
+def count_fruits_quadratic(fruits: list[str]) -> dict[str, int]:
+    """The original implementation, calling `fruits.count` once per element."""
+    return {fruit: fruits.count(fruit) for fruit in fruits}
+
+
+def time_call(func: Callable[[list[str]], dict[str, int]], fruits: list[str]) -> float:
+    start = time.perf_counter()
+    func(fruits)
+    return time.perf_counter() - start
+
+
+def benchmark_categorical(fruits: list[str]) -> None:
+    """Compare the dict path against encoding once and counting integer codes."""
+    start = time.perf_counter()
+    categorical = Categorical.from_labels(fruits)
+    encode = time.perf_counter() - start
+
+    plain = time_call(count_fruits, fruits)
+    coded = time_call(count_fruits, categorical)
+    print(f"\nCategorical counting of {len(fruits)} labels:")
+    print(f"{'dict path':<24}{plain:>10.4f}s")
+    print(f"{'encode (once)':<24}{encode:>10.4f}s")
+    print(f"{'bincount on codes':<24}{coded:>10.4f}s")
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(f"{'Items':>10}{'quadratic':>12}{'single':>12}{'stream':>12}{'parallel':>12}")
+    for size in SIZES:
+        fruits = rng.choices(FRUITS, k=size)
+        quadratic = (
+            f"{time_call(count_fruits_quadratic, fruits):>11.4f}s"
+            if size <= QUADRATIC_MAX_SIZE
+            else f"{'-':>12}"
+        )
+        single = time_call(count_fruits, fruits)
+        stream = time_call(count_fruits_stream, fruits)
+        parallel = time_call(count_fruits_parallel, fruits)
+        print(f"{size:>10}{quadratic}{single:>11.4f}s{stream:>11.4f}s{parallel:>11.4f}s")
+
+    benchmark_categorical(rng.choices(FRUITS, k=CATEGORICAL_SIZE))
+
+
+if __name__ == "__main__":
+    main()
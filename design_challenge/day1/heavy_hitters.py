@@ -0,0 +1,171 @@
+"""Bounded-memory approximate counting of the most frequent fruits in a stream."""
+import heapq
+import math
+import zlib
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from design_challenge.day1.after_tomaluuk import count_fruits_stream
+
+
+@dataclass
+class SpaceSaving:
+    """Space-Saving top-k tracker monitoring at most `capacity` labels.
+
+    Every estimate overcounts the true count by at most `total / capacity`.
+    """
+
+    capacity: int
+    total: int = 0
+    _counts: dict[str, int] = field(default_factory=dict, repr=False)
+    _errors: dict[str, int] = field(default_factory=dict, repr=False)
+    _heap: list[tuple[int, str]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {self.capacity}")
+
+    @classmethod
+    def from_error_bound(cls, epsilon: float) -> "SpaceSaving":
+        """Create a tracker whose estimates overcount by at most `epsilon * total`."""
+        if not 0 < epsilon < 1:
+            raise ValueError(f"epsilon must be between 0 and 1, got {epsilon}")
+        return cls(capacity=math.ceil(1 / epsilon))
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._counts
+
+    def add(self, label: str, count: int = 1) -> None:
+        self.total += count
+
+        if label in self._counts:
+            self._counts[label] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[label] = count
+            self._errors[label] = 0
+        else:
+            # Replace the least frequent label, inheriting its count as the error bound.
+            evicted, min_count = self._pop_min()
+            del self._counts[evicted]
+            del self._errors[evicted]
+            self._counts[label] = min_count + count
+            self._errors[label] = min_count
+
+        self._push(label)
+
+    def update(self, labels: Iterable[str]) -> None:
+        for label in labels:
+            self.add(label)
+
+    def estimate(self, label: str) -> int:
+        """Return the (over)estimated count of `label`, or 0 if it is not monitored."""
+        return self._counts.get(label, 0)
+
+    def error(self, label: str) -> int:
+        """Return the maximum overcount of the estimate for `label`."""
+        return self._errors.get(label, 0)
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        """Return the `k` labels with the highest estimated counts."""
+        return heapq.nlargest(k, self._counts.items(), key=lambda entry: entry[1])
+
+    def _push(self, label: str) -> None:
+        heapq.heappush(self._heap, (self._counts[label], label))
+        # Stale heap entries pile up with every increment; rebuild from live counts.
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, name) for name, count in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[str, int]:
+        while True:
+            count, label = heapq.heappop(self._heap)
+            if self._counts.get(label) == count:
+                return label, count
+
+
+@dataclass
+class CountMinSketch:
+    """Count-Min sketch estimating label counts in `width * depth` counters.
+
+    Estimates never undercount and overcount by at most `epsilon * total`
+    with probability `1 - delta`.
+    """
+
+    width: int
+    depth: int
+    total: int = 0
+    _table: list[list[int]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.depth <= 0:
+            raise ValueError(f"width and depth must be positive, got {self.width}x{self.depth}")
+        self._table = [[0] * self.width for _ in range(self.depth)]
+
+    @classmethod
+    def from_error_bound(cls, epsilon: float, delta: float = 0.01) -> "CountMinSketch":
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError(f"epsilon and delta must be between 0 and 1, got {epsilon}, {delta}")
+        return cls(width=math.ceil(math.e / epsilon), depth=math.ceil(math.log(1 / delta)))
+
+    def _columns(self, label: str) -> list[int]:
+        # crc32 rather than hash() keeps the columns stable across processes.
+        encoded = label.encode()
+        return [zlib.crc32(encoded, row) % self.width for row in range(self.depth)]
+
+    def add(self, label: str, count: int = 1) -> None:
+        self.total += count
+        for row, column in zip(self._table, self._columns(label)):
+            row[column] += count
+
+    def update(self, labels: Iterable[str]) -> None:
+        for label in labels:
+            self.add(label)
+
+    def estimate(self, label: str) -> int:
+        return min(row[column] for row, column in zip(self._table, self._columns(label)))
+
+
+@dataclass
+class HeavyHitterReport:
+    """Comparison of an approximate top-k against exact counts."""
+
+    exact: list[tuple[str, int]]
+    approximate: list[tuple[str, int]]
+    max_error: int
+    error_bound: float
+
+    @property
+    def recall(self) -> float:
+        """Fraction of the exact top-k labels present in the approximate top-k."""
+        if not self.exact:
+            return 1.0
+        found = {label for label, _ in self.approximate}
+        return sum(label in found for label, _ in self.exact) / len(self.exact)
+
+
+def top_fruits(fruits: Iterable[str], k: int, epsilon: float = 0.001) -> list[tuple[str, int]]:
+    """Return the approximate `k` most frequent fruits using bounded memory."""
+    tracker = SpaceSaving(capacity=max(k, math.ceil(1 / epsilon)))
+    tracker.update(fruits)
+    return tracker.top(k)
+
+
+def compare_with_exact(fruits: list[str], tracker: SpaceSaving, k: int) -> HeavyHitterReport:
+    """Feed `fruits` to `tracker` and compare its top-k against `count_fruits_stream`."""
+    tracker.update(fruits)
+    exact_counts = count_fruits_stream(fruits)
+    exact = heapq.nlargest(k, exact_counts.items(), key=lambda entry: entry[1])
+    approximate = tracker.top(k)
+    max_error = max(
+        (count - exact_counts.get(label, 0) for label, count in approximate),
+        default=0,
+    )
+    return HeavyHitterReport(
+        exact=exact,
+        approximate=approximate,
+        max_error=max_error,
+        error_bound=tracker.total / tracker.capacity,
+    )
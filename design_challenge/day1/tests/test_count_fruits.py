@@ -1,5 +1,12 @@
 """Tests for count fruits function."""
-from design_challenge.day1.after_tomaluuk import count_fruits
+from design_challenge.day1 import after_tomaluuk
+from design_challenge.day1.after_tomaluuk import (
+    Categorical,
+    count_fruits,
+    count_fruits_parallel,
+    count_fruits_stream,
+)
+import io
 import pytest
 
 
@@ -36,3 +43,46 @@ def test_omitted_input() -> None:
     """Test an invalid input that is not a list"""
     with pytest.raises(TypeError):
         count_fruits()
+
+
+def test_stream_from_generator() -> None:
+    """Test counting a generator without materializing it as a list."""
+    fruits = (fruit for fruit in ["apple", "banana", "apple"])
+    assert count_fruits_stream(fruits) == {"apple": 2, "banana": 1}
+
+
+def test_stream_from_file() -> None:
+    """Test counting one fruit per line from a file-like object, skipping blank lines."""
+    source = io.StringIO("apple\nbanana\n\napple\ncherry\n")
+    assert count_fruits_stream(source) == {"apple": 2, "banana": 1, "cherry": 1}
+
+
+def test_parallel_matches_single_pass() -> None:
+    """Test that merging chunked partial counts gives the same result as a single pass."""
+    fruits = ["apple", "banana", "apple", "cherry", "banana", "cherry", "apple"] * 10
+    assert count_fruits_parallel(fruits, workers=2, chunk_size=7) == count_fruits(fruits)
+
+
+def test_parallel_invalid_chunk_size() -> None:
+    """Test that a non-positive chunk size is rejected."""
+    with pytest.raises(ValueError):
+        count_fruits_parallel(["apple"], chunk_size=0)
+
+
+def test_categorical_matches_dict_path() -> None:
+    """Test that counting integer codes decodes to the same result as the dict path."""
+    fruits = ["apple", "banana", "apple", "cherry", "banana", "cherry", "apple"]
+    assert count_fruits(Categorical.from_labels(fruits)) == count_fruits(fruits)
+
+
+def test_categorical_skips_unused_vocabulary() -> None:
+    """Test that vocabulary entries without any occurrences are left out of the result."""
+    fruits = Categorical(vocabulary=["apple", "banana", "cherry"], codes=[2, 0, 2])
+    assert count_fruits(fruits) == {"apple": 1, "cherry": 2}
+
+
+def test_categorical_without_numpy(monkeypatch) -> None:
+    """Test the pure-Python fallback used when NumPy is not installed."""
+    monkeypatch.setattr(after_tomaluuk, "np", None)
+    fruits = ["apple", "banana", "apple"]
+    assert count_fruits(Categorical.from_labels(fruits)) == {"apple": 2, "banana": 1}
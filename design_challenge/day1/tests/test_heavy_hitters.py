@@ -0,0 +1,58 @@
+"""Tests for approximate heavy-hitter counting."""
+from design_challenge.day1.after_tomaluuk import count_fruits
+from design_challenge.day1.heavy_hitters import (
+    CountMinSketch,
+    SpaceSaving,
+    compare_with_exact,
+    top_fruits,
+)
+import random
+import pytest
+
+
+def generate_skewed_fruits(size: int, distinct: int = 500) -> list[str]:
+    """A helper function generating a Zipf-like stream of fruit labels."""
+    rng = random.Random(0)
+    labels = [f"fruit-{i}" for i in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(labels, weights=weights, k=size)
+
+
+def test_exact_when_capacity_covers_all_labels():
+    fruits = ["apple", "banana", "apple", "cherry", "banana", "apple"]
+    tracker = SpaceSaving(capacity=3)
+    tracker.update(fruits)
+    assert dict(tracker.top(3)) == count_fruits(fruits)
+
+
+def test_memory_is_bounded():
+    tracker = SpaceSaving(capacity=20)
+    tracker.update(generate_skewed_fruits(10_000))
+    assert len(tracker) == 20
+
+
+def test_space_saving_error_bound():
+    fruits = generate_skewed_fruits(20_000)
+    report = compare_with_exact(fruits, SpaceSaving.from_error_bound(0.01), k=5)
+    assert report.recall == 1.0
+    assert report.max_error <= report.error_bound
+
+
+def test_count_min_never_undercounts():
+    fruits = generate_skewed_fruits(20_000)
+    sketch = CountMinSketch.from_error_bound(0.001)
+    sketch.update(fruits)
+    exact = count_fruits(fruits)
+    for fruit, count in exact.items():
+        assert sketch.estimate(fruit) >= count
+    assert sketch.estimate("fruit-0") <= exact["fruit-0"] + 0.001 * sketch.total
+
+
+def test_top_fruits():
+    fruits = ["apple"] * 5 + ["banana"] * 3 + ["cherry"]
+    assert top_fruits(fruits, k=2) == [("apple", 5), ("banana", 3)]
+
+
+def test_invalid_error_bound():
+    with pytest.raises(ValueError):
+        SpaceSaving.from_error_bound(0)
@@ -1,13 +1,35 @@
-from typing import Callable, TypeVar, Iterable, Sized
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from itertools import chain
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    TypeVar,
+    Iterable,
+    Sized,
+)
+
+from design_challenge.day2 import array_backend
+from design_challenge.day2.pipeline import DEFAULT_CHUNK_SIZE, Pipeline, chunks
 
 T = TypeVar("T")
 U = TypeVar("U")
 FilterFunc = Callable[[T], T]
 ProcessFunc = Callable[[T], U]
+AsyncFilterFunc = Callable[[T], Awaitable[bool] | bool]
+AsyncProcessFunc = Callable[[T], Awaitable[U] | U]
+
+DEFAULT_CONCURRENCY = 10
 
 
 def filter_odd_numbers(numbers: Iterable[int]) -> list[int]:
     """Filters odd numbers from a sequence of numbers."""
+    if array_backend.is_array(numbers):
+        return array_backend.filter_odd_numbers(numbers)
     result: list[int] = []
     for num in numbers:
         if num % 2 == 0:
@@ -17,9 +39,13 @@ def filter_odd_numbers(numbers: Iterable[int]) -> list[int]:
 
 def square_numbers(numbers: Iterable[int | float]) -> list[float]:
     """Square numbers in a sequence."""
+    if array_backend.is_array(numbers):
+        return array_backend.square_numbers(numbers)
     result: list[float] = []
     for num in numbers:
-        result.append(num**2)
+        # num * num is exactly rounded; num**2 goes through libm pow, which can be
+        # off by one ulp and then disagrees with the vectorized array path.
+        result.append(num * num)
     return result
 
 
@@ -35,8 +61,36 @@ def process_data(
     data: T,
     filter_func: FilterFunc[T] | None = None,
     process_func: ProcessFunc[T, U] | None = None,
-) -> T | U:
-    """Applies filter_func and process_func on a data sequence."""
+    lazy: bool = False,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> T | U | Pipeline:
+    """Applies filter_func and process_func on a data sequence.
+
+    With `lazy=True`, returns a `Pipeline` that streams the data through both
+    functions only once it is iterated or `.collect()`-ed.
+
+    With an `executor`, the data is split into chunks of `chunk_size` that are
+    filtered and processed in parallel, and the results are concatenated into a
+    list in input order. Use a `ProcessPoolExecutor` for CPU-bound functions (they
+    must then be picklable) and a `ThreadPoolExecutor` for I/O-bound ones. The first
+    exception raised by a worker is re-raised here.
+    """
+    if executor is not None:
+        if lazy:
+            raise ValueError("process_data cannot be both lazy and run on an executor.")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        return _process_parallel(data, filter_func, process_func, executor, chunk_size)
+
+    if lazy:
+        pipeline = Pipeline(data)
+        if filter_func:
+            pipeline = pipeline.pipe(filter_func)
+        if process_func:
+            pipeline = pipeline.pipe(process_func)
+        return pipeline
+
     if filter_func:
         data = filter_func(data)
     if process_func:
@@ -44,6 +98,87 @@ def process_data(
     return data
 
 
+def _process_chunk(
+    chunk: list, filter_func: FilterFunc | None, process_func: ProcessFunc | None
+) -> list:
+    return list(process_data(chunk, filter_func, process_func))
+
+
+def _process_parallel(
+    data: Iterable,
+    filter_func: FilterFunc | None,
+    process_func: ProcessFunc | None,
+    executor: Executor,
+    chunk_size: int,
+) -> list:
+    parts = list(chunks(data, chunk_size))
+    results = executor.map(
+        _process_chunk, parts, [filter_func] * len(parts), [process_func] * len(parts)
+    )
+    # executor.map yields results in submission order, re-raising worker exceptions.
+    return list(chain.from_iterable(results))
+
+
+async def _aenumerate(data: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[tuple[int, T]]:
+    index = 0
+    if isinstance(data, AsyncIterable):
+        async for item in data:
+            yield index, item
+            index += 1
+    else:
+        for item in data:
+            yield index, item
+            index += 1
+
+
+async def _call(func: Callable[[T], Any], item: T) -> Any:
+    result = func(item)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+async def process_data_async(
+    data: Iterable[T] | AsyncIterable[T],
+    filter_func: AsyncFilterFunc[T] | None = None,
+    process_func: AsyncProcessFunc[T, U] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[T | U]:
+    """Applies filter_func and process_func on each element, up to `concurrency` at a time.
+
+    Unlike `process_data`, both functions take a single element, and may be
+    coroutine functions. `data` may be an async iterable. The results keep the
+    input order. The first exception raised by a function is re-raised here.
+    """
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+
+    source = _aenumerate(data)
+    source_lock = asyncio.Lock()
+    results: dict[int, T | U] = {}
+
+    async def worker() -> None:
+        while True:
+            # Async generators cannot be advanced by several tasks at once.
+            async with source_lock:
+                try:
+                    index, item = await anext(source)
+                except StopAsyncIteration:
+                    return
+            if filter_func is not None and not await _call(filter_func, item):
+                continue
+            results[index] = await _call(process_func, item) if process_func else item
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(concurrency):
+                group.create_task(worker())
+    except ExceptionGroup as error:
+        raise error.exceptions[0] from None
+
+    return [results[index] for index in sorted(results)]
+
+
 def main():
     numbers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
 
@@ -54,6 +189,9 @@ def main():
     result2 = process_data(words, process_func=count_chars)
     print(result2)
 
+    pipeline = process_data(iter(numbers), filter_odd_numbers, square_numbers, lazy=True)
+    print(pipeline.collect())
+
 
 if __name__ == "__main__":
     main()
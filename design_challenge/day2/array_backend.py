@@ -0,0 +1,71 @@
+"""Vectorized versions of the day 2 numeric helpers for NumPy arrays and array.array buffers.
+
+NumPy is optional: without it, array.array inputs are processed element by element
+and still returned as array.array.
+"""
+import math
+from array import array
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+FLOAT_TYPECODES = "fd"
+
+
+def is_array(numbers: Any) -> bool:
+    """Whether `numbers` should be handled by this backend instead of the list path."""
+    return isinstance(numbers, array) or (np is not None and isinstance(numbers, np.ndarray))
+
+
+def filter_odd_numbers(numbers: Any) -> Any:
+    """Filters odd numbers from an array using a boolean mask."""
+    if isinstance(numbers, array):
+        if np is None:
+            return array(numbers.typecode, (num for num in numbers if num % 2 == 0))
+        values = np.asarray(numbers)
+        return array(numbers.typecode, values[_even_mask(values)].tobytes())
+
+    return numbers[_even_mask(numbers)]
+
+
+def square_numbers(numbers: Any) -> Any:
+    """Square numbers in an array, without the overflow of fixed-width integer types.
+
+    Squares of an integer array.array are returned with typecode "q" and raise
+    OverflowError if they do not fit, like any other out-of-range array item.
+    """
+    if isinstance(numbers, array):
+        # Like the list path, which squares array items as Python ints and floats.
+        typecode = "d" if numbers.typecode in FLOAT_TYPECODES else "q"
+        if np is None:
+            return array(typecode, (num * num for num in numbers))
+        values = np.asarray(numbers)
+        squares = _square(values.astype(np.float64) if typecode == "d" else values)
+        if squares.dtype == np.dtype(typecode):
+            return array(typecode, squares.tobytes())
+        return array(typecode, squares.tolist())
+
+    return _square(numbers)
+
+
+def _even_mask(values: "np.ndarray") -> "np.ndarray":
+    # inf % 2 is NaN, which is dropped like in the list path; just silence the warning.
+    with np.errstate(invalid="ignore"):
+        return values % 2 == 0
+
+
+def _square(values: "np.ndarray") -> "np.ndarray":
+    if values.dtype.kind not in "iu":
+        return values * values
+
+    # Square in 64 bits while that is exact, otherwise fall back to Python ints.
+    wide = values.astype(np.int64 if values.dtype.kind == "i" else np.uint64)
+    if wide.size:
+        largest = max(-int(wide.min()), int(wide.max()))
+        if largest > math.isqrt(int(np.iinfo(wide.dtype).max)):
+            objects = values.astype(object)
+            return objects * objects
+    return wide * wide
@@ -0,0 +1,125 @@
+"""Benchmark process_data: fused pipeline overhead and parallel executor scaling."""
+import asyncio
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from design_challenge.day2.after_tomaluuk import process_data, process_data_async
+from design_challenge.day2.pipeline import Pipeline
+
+SIZE = 10**6
+PARALLEL_SIZE = 20_000
+ASYNC_SIZE = 200
+SERVICE_LATENCY = 0.01
+
+
+def is_even(num: int) -> bool:
+    return num % 2 == 0
+
+
+def square(num: int) -> int:
+    return num**2
+
+
+def is_large(num: int) -> bool:
+    return num > 100
+
+
+def add_one(num: int) -> int:
+    return num + 1
+
+
+def nested(numbers: range) -> list[int]:
+    """Four stages as nested process_data calls, building a list per hop."""
+    squares = process_data(
+        numbers,
+        lambda nums: [num for num in nums if is_even(num)],
+        lambda nums: [square(num) for num in nums],
+    )
+    return process_data(
+        squares,
+        lambda nums: [num for num in nums if is_large(num)],
+        lambda nums: [add_one(num) for num in nums],
+    )
+
+
+def fused(numbers: range) -> list[int]:
+    """The same four stages fused into a single pass per element."""
+    return Pipeline(numbers).filter(is_even).map(square).filter(is_large).map(add_one).collect()
+
+
+def collatz_steps(numbers: list[int]) -> list[int]:
+    """A CPU-bound, picklable processing stage."""
+    result: list[int] = []
+    for num in numbers:
+        steps = 0
+        while num > 1:
+            num = num // 2 if num % 2 == 0 else 3 * num + 1
+            steps += 1
+        result.append(steps)
+    return result
+
+
+def benchmark_workers() -> None:
+    numbers = list(range(1, PARALLEL_SIZE + 1))
+    expected = process_data(numbers, process_func=collatz_steps)
+    print(f"\nProcess pool scaling over {PARALLEL_SIZE} items:")
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            result = process_data(
+                numbers, process_func=collatz_steps, executor=executor, chunk_size=1000
+            )
+            elapsed = time.perf_counter() - start
+        assert result == expected
+        print(f"{workers:>3} workers{elapsed:>10.4f}s")
+
+
+class FakeLookupService:
+    """A local stand-in for a slow service, answering each call after `latency` seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def is_valid(self, num: int) -> bool:
+        await asyncio.sleep(self.latency)
+        return num % 3 != 0
+
+    async def enrich(self, num: int) -> dict[str, int]:
+        await asyncio.sleep(self.latency)
+        return {"id": num, "score": num * 7 % 100}
+
+
+def benchmark_async() -> None:
+    service = FakeLookupService(SERVICE_LATENCY)
+    numbers = range(ASYNC_SIZE)
+    print(f"\nAsync process_data over {ASYNC_SIZE} items, {SERVICE_LATENCY * 1000:.0f} ms per call:")
+    for concurrency in [1, 10, 50, 200]:
+        start = time.perf_counter()
+        asyncio.run(process_data_async(numbers, service.is_valid, service.enrich, concurrency))
+        elapsed = time.perf_counter() - start
+        print(f"{concurrency:>4} concurrent{elapsed:>10.4f}s")
+
+
+def main() -> None:
+    numbers = range(SIZE)
+    assert nested(numbers) == fused(numbers)
+
+    for name, func in [("nested process_data", nested), ("fused pipeline", fused)]:
+        start = time.perf_counter()
+        func(numbers)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        func(numbers)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<22}{elapsed * 1e9 / SIZE:>8.1f} ns/element{peak / 2**20:>8.1f} MiB peak")
+
+    benchmark_workers()
+    benchmark_async()
+
+
+if __name__ == "__main__":
+    main()
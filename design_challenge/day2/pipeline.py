@@ -0,0 +1,79 @@
+"""Lazy pipelines that stream data through sequence-processing stages."""
+from itertools import islice
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+Stage = Callable[[Iterable[T]], Iterable[U]]
+Predicate = Callable[[T], bool]
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def chunks(data: Iterable[T], chunk_size: int) -> Iterator[list[T]]:
+    iterator = iter(data)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _staged(stage: Stage[Any, Any], data: Iterable[Any], chunk_size: int) -> Iterator[Any]:
+    for chunk in chunks(data, chunk_size):
+        yield from stage(chunk)
+
+
+class Pipeline(Generic[T]):
+    """A lazy sequence of stages, evaluated only when iterated or collected.
+
+    A stage is any function taking a sequence and returning a sequence, such as
+    `filter_odd_numbers`. Stages are fed `chunk_size` elements at a time, so memory
+    stays bounded regardless of input length. This requires stages to work element
+    by element, as all helpers in this package do.
+
+    Element-wise stages added with `filter` and `map` are not run one after the
+    other: adjacent ones are fused into a single loop, so each element passes
+    through all of them before the next is read and no intermediate containers
+    are built.
+
+    The stages are chained anew every time the pipeline is iterated, so it can be
+    collected again as long as `data` can be iterated again.
+    """
+
+    def __init__(
+        self,
+        data: Iterable[Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        _steps: tuple[tuple[Callable | None, Callable], ...] = (),
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self._data = data
+        # (filter or map, function) for element-wise stages, (None, stage) for sequence stages.
+        self._steps = _steps
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[T]:
+        # Stacking the builtin lazy iterators keeps the per-element loop in C: each
+        # element is pulled through every stage before the next one is read.
+        iterator = iter(self._data)
+        for kind, func in self._steps:
+            if kind is None:
+                iterator = _staged(func, iterator, self.chunk_size)
+            else:
+                iterator = kind(func, iterator)
+        return iterator
+
+    def filter(self, predicate: Predicate[T]) -> "Pipeline[T]":
+        """Return a new pipeline that keeps only elements for which `predicate` is true."""
+        return Pipeline(self._data, self.chunk_size, self._steps + ((filter, predicate),))
+
+    def map(self, func: Callable[[T], U]) -> "Pipeline[U]":
+        """Return a new pipeline that applies `func` to every element."""
+        return Pipeline(self._data, self.chunk_size, self._steps + ((map, func),))
+
+    def pipe(self, stage: Stage[T, U]) -> "Pipeline[U]":
+        """Return a new pipeline that also runs `stage` over the data."""
+        return Pipeline(self._data, self.chunk_size, self._steps + ((None, stage),))
+
+    def collect(self) -> list[T]:
+        """Evaluate the pipeline and return its output as a list."""
+        return list(self)
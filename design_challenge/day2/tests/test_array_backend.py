@@ -0,0 +1,70 @@
+"""Tests for the vectorized array backend of the day 2 numeric helpers."""
+from design_challenge.day2 import array_backend
+from design_challenge.day2.after_tomaluuk import filter_odd_numbers, process_data, square_numbers
+from array import array
+import math
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def backend(request, monkeypatch):
+    """Run array.array tests both with and without NumPy."""
+    if request.param == "pure-python":
+        monkeypatch.setattr(array_backend, "np", None)
+    return request.param
+
+
+def random_floats(size: int = 1000) -> list[float]:
+    rng = random.Random(0)
+    return [rng.uniform(-1e6, 1e6) for _ in range(size)] + [0.0, -2.0, math.inf, -math.inf, math.nan]
+
+
+def test_ndarray_matches_list_path():
+    numbers = list(range(-500, 500))
+    values = np.array(numbers)
+    assert filter_odd_numbers(values).tolist() == filter_odd_numbers(numbers)
+    assert square_numbers(values).tolist() == square_numbers(numbers)
+
+
+def test_float_squares_match_bit_for_bit():
+    numbers = random_floats()
+    expected = square_numbers(numbers)
+    result = square_numbers(np.array(numbers)).tolist()
+    assert [repr(num) for num in result] == [repr(num) for num in expected]
+
+
+def test_float_filter_matches_list_path():
+    numbers = random_floats() + [4.0, 3.5, -6.0]
+    assert filter_odd_numbers(np.array(numbers)).tolist() == filter_odd_numbers(numbers)
+
+
+def test_small_int_dtypes_do_not_overflow():
+    values = np.array([100, -128, 127], dtype=np.int8)
+    assert square_numbers(values).tolist() == [10000, 16384, 16129]
+
+
+def test_large_ints_fall_back_to_python_ints():
+    numbers = [2**40, -(2**62), 3]
+    assert square_numbers(np.array(numbers, dtype=np.int64)).tolist() == square_numbers(numbers)
+
+
+def test_array_array_matches_list_path(backend):
+    ints = array("q", range(-50, 50))
+    assert filter_odd_numbers(ints) == array("q", filter_odd_numbers(list(ints)))
+    assert square_numbers(ints) == array("q", square_numbers(list(ints)))
+
+    floats = array("f", [1.5, -2.0, 3.25])
+    assert square_numbers(floats) == array("d", square_numbers(list(floats)))
+
+
+def test_array_array_square_overflow(backend):
+    with pytest.raises(OverflowError):
+        square_numbers(array("q", [2**40]))
+
+
+def test_process_data_over_arrays():
+    values = np.arange(10)
+    assert process_data(values, filter_odd_numbers, square_numbers).tolist() == [0, 4, 16, 36, 64]
@@ -0,0 +1,65 @@
+"""Tests for the asyncio variant of process_data."""
+from design_challenge.day2.after_tomaluuk import process_data_async
+import asyncio
+import random
+import pytest
+
+
+async def slow_square(num: int) -> int:
+    await asyncio.sleep(random.uniform(0, 0.005))
+    return num * num
+
+
+async def is_even(num: int) -> bool:
+    await asyncio.sleep(random.uniform(0, 0.005))
+    return num % 2 == 0
+
+
+async def numbers_from_stream(size: int):
+    for num in range(size):
+        await asyncio.sleep(0)
+        yield num
+
+
+def test_results_keep_input_order():
+    result = asyncio.run(process_data_async(range(100), is_even, slow_square, concurrency=8))
+    assert result == [num * num for num in range(100) if num % 2 == 0]
+
+
+def test_async_iterable_input():
+    result = asyncio.run(process_data_async(numbers_from_stream(20), process_func=slow_square))
+    assert result == [num * num for num in range(20)]
+
+
+def test_sync_callables_are_accepted():
+    result = asyncio.run(process_data_async(["apple", "kiwi"], process_func=len))
+    assert result == [5, 4]
+
+
+def test_concurrency_is_bounded():
+    running = 0
+    peak = 0
+
+    async def track(num: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return num
+
+    asyncio.run(process_data_async(range(50), process_func=track, concurrency=4))
+    assert peak == 4
+
+
+def test_exceptions_propagate():
+    async def fail(num: int) -> int:
+        raise ValueError(num)
+
+    with pytest.raises(ValueError):
+        asyncio.run(process_data_async(range(5), process_func=fail))
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(process_data_async([], concurrency=0))
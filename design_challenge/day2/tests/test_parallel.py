@@ -0,0 +1,43 @@
+"""Tests for running process_data on thread and process pools."""
+from design_challenge.day2.after_tomaluuk import (
+    count_chars,
+    filter_odd_numbers,
+    process_data,
+    square_numbers,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+
+
+def fail_on_seven(numbers: list[int]) -> list[int]:
+    if 7 in numbers:
+        raise ArithmeticError("seven")
+    return numbers
+
+
+@pytest.fixture(params=[ThreadPoolExecutor, ProcessPoolExecutor])
+def executor(request):
+    with request.param(max_workers=2) as pool:
+        yield pool
+
+
+def test_parallel_preserves_order(executor):
+    numbers = list(range(1000))
+    expected = process_data(numbers, filter_odd_numbers, square_numbers)
+    result = process_data(numbers, filter_odd_numbers, square_numbers, executor=executor, chunk_size=7)
+    assert result == expected
+
+
+def test_parallel_without_filter(executor):
+    words = ["apple", "banana", "cherry"]
+    assert process_data(words, process_func=count_chars, executor=executor, chunk_size=1) == [5, 6, 6]
+
+
+def test_parallel_propagates_worker_exceptions(executor):
+    with pytest.raises(ArithmeticError):
+        process_data(list(range(20)), process_func=fail_on_seven, executor=executor, chunk_size=5)
+
+
+def test_parallel_cannot_be_lazy():
+    with ThreadPoolExecutor() as pool, pytest.raises(ValueError):
+        process_data([1, 2], filter_odd_numbers, executor=pool, lazy=True)
@@ -0,0 +1,91 @@
+"""Tests for lazy process_data pipelines."""
+from design_challenge.day2.after_tomaluuk import (
+    count_chars,
+    filter_odd_numbers,
+    process_data,
+    square_numbers,
+)
+from design_challenge.day2.pipeline import Pipeline
+from itertools import count, islice
+import pytest
+
+
+def test_lazy_matches_eager():
+    numbers = list(range(5000))
+    eager = process_data(numbers, filter_odd_numbers, square_numbers)
+    lazy = process_data(numbers, filter_odd_numbers, square_numbers, lazy=True)
+    assert lazy.collect() == eager
+
+
+def test_lazy_pipeline_can_be_collected_twice():
+    pipeline = process_data([1, 2, 3, 4], filter_odd_numbers, square_numbers, lazy=True)
+    assert pipeline.collect() == [4, 16]
+    assert pipeline.collect() == [4, 16]
+
+    chained = Pipeline(range(5)).pipe(filter_odd_numbers).map(lambda num: num * 10)
+    assert chained.collect() == chained.collect() == [0, 20, 40]
+
+
+def test_lazy_without_functions():
+    words = ["apple", "banana", "cherry"]
+    assert process_data(words, lazy=True).collect() == words
+
+
+def test_lazy_process_only():
+    words = ["apple", "banana", "cherry"]
+    assert process_data(words, process_func=count_chars, lazy=True).collect() == [5, 6, 6]
+
+
+def test_lazy_streams_infinite_input():
+    pipeline = process_data(count(), filter_odd_numbers, square_numbers, lazy=True)
+    assert list(islice(pipeline, 4)) == [0, 4, 16, 36]
+
+
+def test_pipeline_evaluates_nothing_until_iterated():
+    calls = []
+
+    def record(chunk):
+        calls.append(len(chunk))
+        return chunk
+
+    pipeline = Pipeline(range(10), chunk_size=4).pipe(record)
+    assert calls == []
+    assert pipeline.collect() == list(range(10))
+    assert calls == [4, 4, 2]
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        Pipeline([], chunk_size=0)
+
+
+def test_chained_stages_match_nested_process_data():
+    numbers = list(range(1000))
+    nested = process_data(
+        process_data(numbers, filter_odd_numbers, square_numbers),
+        process_func=lambda squares: [num + 1 for num in squares if num > 100],
+    )
+    chained = (
+        Pipeline(numbers)
+        .filter(lambda num: num % 2 == 0)
+        .map(lambda num: num**2)
+        .filter(lambda num: num > 100)
+        .map(lambda num: num + 1)
+    )
+    assert chained.collect() == nested
+
+
+def test_fused_stages_run_per_element():
+    trace = []
+    pipeline = (
+        Pipeline(range(3))
+        .map(lambda num: trace.append(("map", num)) or num)
+        .filter(lambda num: trace.append(("filter", num)) or True)
+    )
+    pipeline.collect()
+    assert trace == [("map", 0), ("filter", 0), ("map", 1), ("filter", 1), ("map", 2), ("filter", 2)]
+
+
+def test_element_stages_mix_with_sequence_stages():
+    pipeline = Pipeline(range(10)).map(lambda num: num + 1).pipe(filter_odd_numbers).map(str)
+    assert pipeline.collect() == ["2", "4", "6", "8", "10"]
@@ -1,8 +1,10 @@
 from decimal import Decimal
-from typing import Protocol
-from dataclasses import dataclass
+from typing import Protocol, Sequence
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
+from design_challenge.day3.after.events import PRINT_SINK, Event, EventSink
+
 
 class PaymentService(Protocol):
     def set_api_key(self, api_key: str) -> None:
@@ -14,6 +16,35 @@ class PaymentService(Protocol):
     def process_payout(self, amount: Decimal) -> None:
         ...
 
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        ...
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        ...
+
+
+class AsyncPaymentService(Protocol):
+    def set_api_key(self, api_key: str) -> None:
+        ...
+
+    async def process_payment(self, amount: Decimal) -> None:
+        ...
+
+    async def process_payout(self, amount: Decimal) -> None:
+        ...
+
+
+class TransactionType(Enum):
+    DEPOSIT = auto()
+    WITHDRAWAL = auto()
+
+
+class TransactionLog(Protocol):
+    def record(
+        self, transaction_type: TransactionType, account_number: str, amount: Decimal
+    ) -> None:
+        ...
+
 
 class AccountType(Enum):
     SAVINGS = auto()
@@ -28,26 +59,69 @@ class Account:
     account_number: str
     balance: Decimal
     account_type: AccountType
+    events: EventSink = field(default=PRINT_SINK, repr=False, compare=False)
 
     def deposit(
         self,
         amount: Decimal,
     ) -> None:
-        print(f"Depositing {amount} into {self.account_type} Account {self.account_number}.")
+        self._emit(
+            "deposit", "Depositing {amount} into {account_type} Account {account_number}.", amount
+        )
 
         self.balance += amount
 
     def withdraw(self, amount: Decimal) -> None:
-        print(f"Withdrawing {amount} from {self.account_type} Account {self.account_number}.")
+        self._emit(
+            "withdrawal",
+            "Withdrawing {amount} from {account_type} Account {account_number}.",
+            amount,
+        )
 
         self.balance -= amount
 
-
-def deposit(amount: Decimal, account: Account, payment_service: PaymentService) -> None:
+    def _emit(self, name: str, template: str, amount: Decimal) -> None:
+        fields = {
+            "amount": amount,
+            "account_type": self.account_type,
+            "account_number": self.account_number,
+        }
+        self.events.emit(Event(name, template, fields))
+
+
+def deposit(
+    amount: Decimal,
+    account: Account,
+    payment_service: PaymentService,
+    log: TransactionLog | None = None,
+) -> None:
     payment_service.process_payment(amount)
+    if log is not None:
+        log.record(TransactionType.DEPOSIT, account.account_number, amount)
     account.deposit(amount)
 
 
-def withdraw(amount: Decimal, account: Account, payment_service: PaymentService) -> None:
+def withdraw(
+    amount: Decimal,
+    account: Account,
+    payment_service: PaymentService,
+    log: TransactionLog | None = None,
+) -> None:
     payment_service.process_payout(amount)
+    if log is not None:
+        log.record(TransactionType.WITHDRAWAL, account.account_number, amount)
+    account.withdraw(amount)
+
+
+async def deposit_async(
+    amount: Decimal, account: Account, payment_service: AsyncPaymentService
+) -> None:
+    await payment_service.process_payment(amount)
+    account.deposit(amount)
+
+
+async def withdraw_async(
+    amount: Decimal, account: Account, payment_service: AsyncPaymentService
+) -> None:
+    await payment_service.process_payout(amount)
     account.withdraw(amount)
@@ -0,0 +1,80 @@
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable
+
+from design_challenge.day3.after.bank import Account, PaymentService, TransactionType
+
+
+@dataclass
+class PendingTransaction:
+    type: TransactionType
+    amount: Decimal
+    account: Account
+
+
+@dataclass
+class PaymentBatcher:
+    """Accumulates deposits and withdrawals and submits them to the payment service in batches.
+
+    A batch is flushed once it holds `max_batch_size` transactions, or when a new
+    transaction arrives more than `max_delay` seconds after the oldest pending one.
+    Transactions stay pending until the payment service accepts them, and account
+    balances are updated right after each accepted call. If the service raises,
+    the unaccepted transactions remain in `pending` and the next flush retries
+    them, without resubmitting the ones already accepted.
+    """
+
+    payment_service: PaymentService
+    max_batch_size: int = 100
+    max_delay: float = 1.0
+    clock: Callable[[], float] = time.monotonic
+    pending: list[PendingTransaction] = field(default_factory=list)
+    _oldest: float | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_batch_size <= 0:
+            raise ValueError(f"max_batch_size must be positive, got {self.max_batch_size}")
+
+    def __enter__(self) -> "PaymentBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Leave the batch pending if the block failed; the caller decides whether to submit it.
+        if exc_type is None:
+            self.flush()
+
+    def deposit(self, amount: Decimal, account: Account) -> None:
+        self._add(PendingTransaction(TransactionType.DEPOSIT, amount, account))
+
+    def withdraw(self, amount: Decimal, account: Account) -> None:
+        self._add(PendingTransaction(TransactionType.WITHDRAWAL, amount, account))
+
+    def _add(self, transaction: PendingTransaction) -> None:
+        now = self.clock()
+        if self._oldest is None:
+            self._oldest = now
+        self.pending.append(transaction)
+
+        if len(self.pending) >= self.max_batch_size or now - self._oldest >= self.max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+
+        deposits = [t for t in self.pending if t.type == TransactionType.DEPOSIT]
+        if deposits:
+            self.payment_service.process_payments([t.amount for t in deposits])
+            for transaction in deposits:
+                transaction.account.deposit(transaction.amount)
+            self.pending = [t for t in self.pending if t.type != TransactionType.DEPOSIT]
+
+        withdrawals = self.pending
+        if withdrawals:
+            self.payment_service.process_payouts([t.amount for t in withdrawals])
+            for transaction in withdrawals:
+                transaction.account.withdraw(transaction.amount)
+            self.pending = []
+
+        self._oldest = None
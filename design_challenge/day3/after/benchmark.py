@@ -0,0 +1,300 @@
+import asyncio
+import contextlib
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Sequence
+
+from design_challenge.day3.after.bank import Account, AccountType, TransactionType, deposit
+from design_challenge.day3.after.batching import PaymentBatcher, PendingTransaction
+from design_challenge.day3.after.events import NULL_SINK, PRINT_SINK, EventSink, QueueSink
+from design_challenge.day3.after.journal import Journal, recover
+from design_challenge.day3.after.ledger import Ledger
+from design_challenge.day3.after.pool import PaymentClientPool, PooledPaymentService
+from design_challenge.day3.after.settlement import settle
+
+TRANSACTIONS = 2_000
+REQUEST_LATENCY = 0.001
+POOLED_TRANSACTIONS = 1_000
+API_KEY = "sk_test_1234567890"
+SETTLEMENT_ACCOUNTS = 2_000
+PROVIDER_LATENCY = 0.005
+LEDGER_THREADS = 8
+LEDGER_OPERATIONS = 20_000
+JOURNAL_TRANSACTIONS = 10**6
+LOGGED_TRANSACTIONS = 200_000
+
+
+@dataclass
+class StubPaymentService:
+    """A local stand-in for a payment provider where every request costs `latency` seconds."""
+
+    latency: float = REQUEST_LATENCY
+    requests: int = 0
+
+    def _request(self) -> None:
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def set_api_key(self, api_key: str) -> None:
+        pass
+
+    def process_payment(self, amount: Decimal) -> None:
+        self._request()
+
+    def process_payout(self, amount: Decimal) -> None:
+        self._request()
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        self._request()
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        self._request()
+
+
+class StandInProviderHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a JSON OK, keeping the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle delay the body.
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@dataclass
+class HttpPaymentClient:
+    """A payment client holding one HTTP connection to the stand-in provider."""
+
+    host: str
+    port: int
+    api_key: str
+    connection: http.client.HTTPConnection = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.connection = http.client.HTTPConnection(self.host, self.port)
+        self.connection.connect()
+
+    def _post(self, path: str, amounts: Sequence[Decimal]) -> None:
+        body = json.dumps([str(amount) for amount in amounts])
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        self.connection.request("POST", path, body, headers)
+        self.connection.getresponse().read()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def set_api_key(self, api_key: str) -> None:
+        self.api_key = api_key
+
+    def process_payment(self, amount: Decimal) -> None:
+        self._post("/payments", [amount])
+
+    def process_payout(self, amount: Decimal) -> None:
+        self._post("/payouts", [amount])
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        self._post("/payments", amounts)
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        self._post("/payouts", amounts)
+
+
+@dataclass
+class FakeAsyncProvider:
+    """A local async stand-in for a payment provider answering after `latency` seconds."""
+
+    latency: float = PROVIDER_LATENCY
+    calls: int = 0
+
+    def set_api_key(self, api_key: str) -> None:
+        pass
+
+    async def process_payment(self, amount: Decimal) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    async def process_payout(self, amount: Decimal) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+
+def create_accounts(count: int = 100, events: EventSink = NULL_SINK) -> list[Account]:
+    return [
+        Account(f"SA{i:03}", Decimal("1000"), AccountType.SAVINGS, events) for i in range(count)
+    ]
+
+
+def benchmark_batching() -> None:
+    print(f"Settling {TRANSACTIONS} deposits, {REQUEST_LATENCY * 1000:.0f} ms per provider request:")
+
+    service = StubPaymentService()
+    accounts = create_accounts()
+    start = time.perf_counter()
+    for i in range(TRANSACTIONS):
+        deposit(Decimal("1.00"), accounts[i % len(accounts)], service)
+    elapsed = time.perf_counter() - start
+    print(f"{'unbatched':<16}{TRANSACTIONS / elapsed:>10.0f} tx/s{service.requests:>8} requests")
+
+    for batch_size in [10, 100, 1000]:
+        service = StubPaymentService()
+        accounts = create_accounts()
+        start = time.perf_counter()
+        with PaymentBatcher(service, max_batch_size=batch_size) as batcher:
+            for i in range(TRANSACTIONS):
+                batcher.deposit(Decimal("1.00"), accounts[i % len(accounts)])
+        elapsed = time.perf_counter() - start
+        label = f"batches of {batch_size}"
+        print(f"{label:<16}{TRANSACTIONS / elapsed:>10.0f} tx/s{service.requests:>8} requests")
+
+
+def benchmark_pooling() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInProviderHandler)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"\nDeposit latency against a local HTTP stand-in, {POOLED_TRANSACTIONS} transactions:")
+    try:
+        accounts = create_accounts()
+        start = time.perf_counter()
+        for i in range(POOLED_TRANSACTIONS):
+            # A fresh client per transaction, like day3/before's BankService.
+            client = HttpPaymentClient(host, port, API_KEY)
+            deposit(Decimal("1.00"), accounts[i % len(accounts)], client)
+            client.close()
+        elapsed = time.perf_counter() - start
+        print(f"{'client per call':<16}{elapsed / POOLED_TRANSACTIONS * 1e6:>10.0f} us/tx")
+
+        pool = PaymentClientPool(
+            client_factory=lambda api_key: HttpPaymentClient(host, port, api_key),
+            max_clients_per_key=4,
+        )
+        service = PooledPaymentService(pool, API_KEY)
+        start = time.perf_counter()
+        for i in range(POOLED_TRANSACTIONS):
+            deposit(Decimal("1.00"), accounts[i % len(accounts)], service)
+        elapsed = time.perf_counter() - start
+        print(f"{'pooled':<16}{elapsed / POOLED_TRANSACTIONS * 1e6:>10.0f} us/tx")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def benchmark_settlement() -> None:
+    print(
+        f"\nSettling {SETTLEMENT_ACCOUNTS} accounts (deposit + withdrawal each), "
+        f"{PROVIDER_LATENCY * 1000:.0f} ms per provider call:"
+    )
+    for concurrency in [1, 10, 100, 1000]:
+        accounts = create_accounts(SETTLEMENT_ACCOUNTS)
+        transactions = [
+            PendingTransaction(transaction_type, Decimal("10.00"), account)
+            for account in accounts
+            for transaction_type in (TransactionType.DEPOSIT, TransactionType.WITHDRAWAL)
+        ]
+        provider = FakeAsyncProvider()
+        start = time.perf_counter()
+        asyncio.run(settle(transactions, provider, concurrency))
+        elapsed = time.perf_counter() - start
+        print(f"{concurrency:>5} concurrent{len(transactions) / elapsed:>10.0f} tx/s")
+
+
+def benchmark_ledger() -> None:
+    print(f"\nLedger transfers, {LEDGER_THREADS} threads x {LEDGER_OPERATIONS} operations:")
+    for stripes in [1, 64]:
+        ledger = Ledger(stripes=stripes)
+        ledger.add_accounts(create_accounts(1000))
+        numbers = [account.account_number for account in ledger]
+        opening_total = ledger.total()
+
+        def work(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(LEDGER_OPERATIONS):
+                source, target = rng.sample(numbers, 2)
+                ledger.transfer(source, target, Decimal("0.01"))
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(LEDGER_THREADS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        assert ledger.total() == opening_total
+        label = "global lock" if stripes == 1 else f"{stripes} stripes"
+        print(f"{label:<16}{LEDGER_THREADS * LEDGER_OPERATIONS / elapsed:>10.0f} tx/s")
+
+
+def benchmark_journal() -> None:
+    print(f"\nJournaling {JOURNAL_TRANSACTIONS} transactions:")
+    amount = Decimal("1.00")
+    for snapshot_every in [JOURNAL_TRANSACTIONS + 1, 100_000]:
+        accounts = {account.account_number: account for account in create_accounts(1000)}
+        numbers = list(accounts)
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            with Journal(directory, accounts, snapshot_every=snapshot_every) as journal:
+                for i in range(JOURNAL_TRANSACTIONS):
+                    account = accounts[numbers[i % len(numbers)]]
+                    journal.record(TransactionType.DEPOSIT, account.account_number, amount)
+                    account.balance += amount
+            write = time.perf_counter() - start
+
+            start = time.perf_counter()
+            balances = recover(directory)
+            recovery = time.perf_counter() - start
+            assert balances == {number: account.balance for number, account in accounts.items()}
+
+        label = "no snapshots" if snapshot_every > JOURNAL_TRANSACTIONS else f"snapshot/{snapshot_every}"
+        print(
+            f"{label:<18}{JOURNAL_TRANSACTIONS / write:>10.0f} tx/s written"
+            f"{recovery:>10.3f}s recovery"
+        )
+
+
+def benchmark_logging() -> None:
+    print(f"\nLogging {LOGGED_TRANSACTIONS} deposits to a line-buffered stream:")
+    service = StubPaymentService(latency=0)
+    # Line buffering, like a terminal, makes every print its own write.
+    with open(os.devnull, "w", buffering=1) as stream, contextlib.redirect_stdout(stream):
+        for label, sink in [("print", PRINT_SINK), ("queued", QueueSink(stream)), ("null", NULL_SINK)]:
+            accounts = create_accounts(events=sink)
+            start = time.perf_counter()
+            for i in range(LOGGED_TRANSACTIONS):
+                deposit(Decimal("1.00"), accounts[i % len(accounts)], service)
+            elapsed = time.perf_counter() - start
+            if isinstance(sink, QueueSink):
+                sink.close()
+            print(f"{label:<16}{LOGGED_TRANSACTIONS / elapsed:>10.0f} tx/s", file=sys.__stdout__)
+
+
+def main() -> None:
+    benchmark_batching()
+    benchmark_pooling()
+    benchmark_settlement()
+    benchmark_ledger()
+    benchmark_journal()
+    benchmark_logging()
+
+
+if __name__ == "__main__":
+    main()
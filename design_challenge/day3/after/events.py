@@ -0,0 +1,91 @@
+import queue
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TextIO
+
+
+@dataclass(frozen=True)
+class Event:
+    """A structured log event; the message is only formatted when a sink needs it."""
+
+    name: str
+    template: str
+    fields: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def message(self) -> str:
+        return self.template.format(**self.fields)
+
+
+class EventSink(Protocol):
+    def emit(self, event: Event) -> None:
+        ...
+
+
+class PrintSink:
+    """Prints every event's message synchronously, as the classes used to do themselves."""
+
+    def emit(self, event: Event) -> None:
+        print(event.message)
+
+
+class NullSink:
+    """Drops every event."""
+
+    def emit(self, event: Event) -> None:
+        pass
+
+
+PRINT_SINK = PrintSink()
+NULL_SINK = NullSink()
+
+_STOP = object()
+
+
+class QueueSink:
+    """Hands events to a background thread that formats and writes them in batches.
+
+    `emit` only puts the event on a queue, so the caller never waits for I/O. Call
+    `close` (or use it as a context manager) to write out the remaining events.
+    """
+
+    def __init__(self, stream: TextIO | None = None, batch_size: int = 1000) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.stream = stream if stream is not None else sys.stdout
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_events, daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> "QueueSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def emit(self, event: Event) -> None:
+        self._queue.put(event)
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _write_events(self) -> None:
+        while True:
+            # Block for the first event, then take whatever else is already queued.
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            lines = [event.message for event in batch if event is not _STOP]
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            if stop:
+                return
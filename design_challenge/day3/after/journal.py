@@ -0,0 +1,167 @@
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from design_challenge.day3.after.bank import Account, TransactionType
+
+JOURNAL_FILE = "journal.bin"
+SNAPSHOT_FILE = "snapshot.json"
+
+# crc32 of the rest of the record, transaction type, account number length, amount length.
+_HEADER = struct.Struct("<IBBB")
+
+
+@dataclass
+class JournalRecord:
+    type: TransactionType
+    account_number: str
+    amount: Decimal
+
+
+def _encode(transaction_type: TransactionType, account_number: str, amount: Decimal) -> bytes:
+    number = account_number.encode()
+    value = str(amount).encode()
+    body = bytes((transaction_type.value, len(number), len(value))) + number + value
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def read_records(file: BinaryIO) -> Iterator[JournalRecord]:
+    """Read records until the end of the file or a torn or corrupt record."""
+    while header := file.read(_HEADER.size):
+        if len(header) < _HEADER.size:
+            return
+        crc, type_value, number_length, value_length = _HEADER.unpack(header)
+        payload = file.read(number_length + value_length)
+        if len(payload) < number_length + value_length or zlib.crc32(header[4:] + payload) != crc:
+            return
+        yield JournalRecord(
+            TransactionType(type_value),
+            payload[:number_length].decode(),
+            Decimal(payload[number_length:].decode()),
+        )
+
+
+@dataclass
+class Journal:
+    """An append-only, binary log of account transactions with periodic balance snapshots.
+
+    Records are buffered and written `group_size` at a time (group commit), so a
+    crash loses at most the last uncommitted group. With `sync=True` every group
+    is also fsync-ed to disk. After every `snapshot_every` records, the balances
+    of `accounts` are snapshotted together with the journal position, so recovery
+    only has to replay the records written since.
+    """
+
+    directory: Path
+    accounts: dict[str, Account] = field(default_factory=dict)
+    group_size: int = 1000
+    snapshot_every: int = 100_000
+    sync: bool = False
+    _file: BinaryIO = field(init=False, repr=False)
+    _buffer: bytearray = field(default_factory=bytearray, repr=False)
+    _buffered: int = field(default=0, repr=False)
+    _since_snapshot: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.group_size <= 0:
+            raise ValueError(f"group_size must be positive, got {self.group_size}")
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._truncate_torn_tail()
+        self._file = open(self.directory / JOURNAL_FILE, "ab")
+        if not (self.directory / SNAPSHOT_FILE).exists():
+            # Without a snapshot, the opening balances would be lost on recovery.
+            self.snapshot()
+
+    def _truncate_torn_tail(self) -> None:
+        """Cut off a partially written last record, so new records are not appended after it."""
+        journal_path = self.directory / JOURNAL_FILE
+        snapshot_path = self.directory / SNAPSHOT_FILE
+        if not journal_path.exists() or not snapshot_path.exists():
+            return
+        with open(snapshot_path) as file:
+            offset = json.load(file)["offset"]
+        with open(journal_path, "r+b") as file:
+            file.seek(offset)
+            end = offset
+            for _ in read_records(file):
+                end = file.tell()
+            file.truncate(end)
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, transaction_type: TransactionType, account_number: str, amount: Decimal) -> None:
+        # Snapshot before appending, while the accounts match the journal so far.
+        if self.accounts and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+        self._buffer += _encode(transaction_type, account_number, amount)
+        self._buffered += 1
+        self._since_snapshot += 1
+        if self._buffered >= self.group_size:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write all buffered records to the journal file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def snapshot(self) -> None:
+        """Commit, then atomically replace the snapshot with the current balances."""
+        self.commit()
+        snapshot = {
+            "offset": self._file.tell(),
+            "balances": {number: str(account.balance) for number, account in self.accounts.items()},
+        }
+        temporary = self.directory / f"{SNAPSHOT_FILE}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(snapshot, file)
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        os.replace(temporary, self.directory / SNAPSHOT_FILE)
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
+
+
+def recover(directory: Path) -> dict[str, Decimal]:
+    """Rebuild account balances from the latest snapshot and the journal tail after it."""
+    directory = Path(directory)
+    with open(directory / SNAPSHOT_FILE) as file:
+        snapshot = json.load(file)
+    balances = {number: Decimal(balance) for number, balance in snapshot["balances"].items()}
+
+    with open(directory / JOURNAL_FILE, "rb") as file:
+        file.seek(snapshot["offset"])
+        for record in read_records(file):
+            balance = balances.get(record.account_number, Decimal(0))
+            if record.type == TransactionType.DEPOSIT:
+                balances[record.account_number] = balance + record.amount
+            else:
+                balances[record.account_number] = balance - record.amount
+    return balances
+
+
+def restore(accounts: Iterable[Account], directory: Path) -> None:
+    """Set the balance of each account to its recovered balance."""
+    balances = recover(directory)
+    for account in accounts:
+        if account.account_number in balances:
+            account.balance = balances[account.account_number]
@@ -0,0 +1,97 @@
+import threading
+import zlib
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+from design_challenge.day3.after.bank import Account
+
+DEFAULT_STRIPES = 64
+
+
+class AccountNotFoundException(Exception):
+    def __init__(self, account_number: str, message="No account found with number"):
+        self.account_number = account_number
+        self.message = f"{message} '{self.account_number}'"
+        super().__init__(self.message)
+
+
+@dataclass
+class Ledger:
+    """Thread-safe access to many accounts, guarded by `stripes` locks.
+
+    Each account is guarded by the lock of its stripe, so updates to accounts on
+    different stripes never contend, while updates to the same account are
+    serialized. With `stripes=1` this is a single global lock.
+    """
+
+    stripes: int = DEFAULT_STRIPES
+    _accounts: dict[str, Account] = field(default_factory=dict, repr=False)
+    _locks: list[threading.Lock] = field(init=False, repr=False)
+    _registry_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.stripes <= 0:
+            raise ValueError(f"stripes must be positive, got {self.stripes}")
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __iter__(self) -> Iterator[Account]:
+        with self._registry_lock:
+            return iter(list(self._accounts.values()))
+
+    def add_accounts(self, accounts: Iterable[Account]) -> None:
+        with self._registry_lock:
+            for account in accounts:
+                self._accounts[account.account_number] = account
+
+    def find_account(self, account_number: str) -> Account:
+        try:
+            return self._accounts[account_number]
+        except KeyError:
+            raise AccountNotFoundException(account_number) from None
+
+    def _stripe(self, account_number: str) -> int:
+        return zlib.crc32(account_number.encode()) % self.stripes
+
+    def deposit(self, account_number: str, amount: Decimal) -> None:
+        account = self.find_account(account_number)
+        with self._locks[self._stripe(account_number)]:
+            account.deposit(amount)
+
+    def withdraw(self, account_number: str, amount: Decimal) -> None:
+        account = self.find_account(account_number)
+        with self._locks[self._stripe(account_number)]:
+            account.withdraw(amount)
+
+    def transfer(self, source_number: str, target_number: str, amount: Decimal) -> None:
+        source = self.find_account(source_number)
+        target = self.find_account(target_number)
+        # Always lock stripes in index order so opposite transfers cannot deadlock.
+        stripes = sorted({self._stripe(source_number), self._stripe(target_number)})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            source.withdraw(amount)
+            target.deposit(amount)
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+
+    def balance(self, account_number: str) -> Decimal:
+        account = self.find_account(account_number)
+        with self._locks[self._stripe(account_number)]:
+            return account.balance
+
+    def total(self) -> Decimal:
+        """Sum of all balances, taken as a consistent snapshot under every lock."""
+        with self._registry_lock:
+            for lock in self._locks:
+                lock.acquire()
+            try:
+                return sum((account.balance for account in self._accounts.values()), Decimal(0))
+            finally:
+                for lock in reversed(self._locks):
+                    lock.release()
@@ -1,6 +1,6 @@
 from decimal import Decimal
-from bank import Account, AccountType, withdraw, deposit
-from stripe_service import StripePaymentService
+from design_challenge.day3.after.bank import Account, AccountType, withdraw, deposit
+from design_challenge.day3.after.stripe_service import StripePaymentService
 
 
 def main() -> None:
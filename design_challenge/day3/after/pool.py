@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Iterator, Sequence
+
+from design_challenge.day3.after.bank import PaymentService
+from design_challenge.day3.after.stripe_service import StripePaymentService
+
+
+class PoolExhaustedException(Exception):
+    def __init__(self, api_key: str, timeout: float):
+        self.api_key = api_key
+        self.message = (
+            f"No payment client for API key '{api_key[:7]}...' became free within {timeout}s."
+        )
+        super().__init__(self.message)
+
+
+def create_stripe_client(api_key: str) -> PaymentService:
+    return StripePaymentService(api_key=api_key)
+
+
+def close_client(client: PaymentService) -> None:
+    """Close a dropped client's connections, if it has a `close` method."""
+    close = getattr(client, "close", None)
+    if close is not None:
+        # The client is being dropped as unusable already; a failing close changes nothing.
+        with suppress(Exception):
+            close()
+
+
+@dataclass
+class IdleClient:
+    client: PaymentService
+    returned_at: float
+
+
+@dataclass
+class PaymentClientPool:
+    """A bounded pool of reusable payment clients, kept per API key.
+
+    Checking out takes an idle client for the key, or creates one while fewer than
+    `max_clients_per_key` exist, or else waits up to `checkout_timeout` seconds for
+    one to be returned. Idle clients failing `health_check` are discarded on
+    checkout, and clients idle for longer than `idle_timeout` are evicted. Health
+    checks, creating and closing clients all run without holding the pool's lock,
+    and every client the pool drops is closed.
+    """
+
+    client_factory: Callable[[str], PaymentService] = create_stripe_client
+    max_clients_per_key: int = 10
+    idle_timeout: float = 60.0
+    checkout_timeout: float = 5.0
+    health_check: Callable[[PaymentService], bool] = lambda client: True
+    clock: Callable[[], float] = time.monotonic
+    _idle: dict[str, deque[IdleClient]] = field(default_factory=dict, repr=False)
+    _sizes: dict[str, int] = field(default_factory=dict, repr=False)
+    _condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_clients_per_key <= 0:
+            raise ValueError(
+                f"max_clients_per_key must be positive, got {self.max_clients_per_key}"
+            )
+
+    def size(self, api_key: str) -> int:
+        """Number of clients for `api_key`, both checked out and idle."""
+        with self._condition:
+            return self._sizes.get(api_key, 0)
+
+    def checkout(self, api_key: str) -> PaymentService:
+        deadline = self.clock() + self.checkout_timeout
+        while True:
+            client = None
+            with self._condition:
+                while True:
+                    idle = self._idle.setdefault(api_key, deque())
+                    if idle:
+                        # Most recently returned first, so surplus clients go idle and get evicted.
+                        client = idle.pop().client
+                        break
+                    if self._sizes.get(api_key, 0) < self.max_clients_per_key:
+                        self._sizes[api_key] = self._sizes.get(api_key, 0) + 1
+                        break
+
+                    remaining = deadline - self.clock()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        raise PoolExhaustedException(api_key, self.checkout_timeout)
+
+            if client is None:
+                break
+            # The popped client keeps its slot while its health is checked outside the lock.
+            if self.health_check(client):
+                return client
+            self.discard(api_key, client)
+
+        # Create outside the lock: setting up a client is the slow part being pooled.
+        try:
+            return self.client_factory(api_key)
+        except Exception:
+            self.discard(api_key)
+            raise
+
+    def checkin(self, api_key: str, client: PaymentService) -> None:
+        with self._condition:
+            self._idle.setdefault(api_key, deque()).append(IdleClient(client, self.clock()))
+            self._condition.notify()
+
+    def discard(self, api_key: str, client: PaymentService | None = None) -> None:
+        """Give up a checked-out client that is broken, closing it and freeing its slot."""
+        with self._condition:
+            self._sizes[api_key] -= 1
+            self._condition.notify()
+        if client is not None:
+            close_client(client)
+
+    @contextmanager
+    def lease(self, api_key: str) -> Iterator[PaymentService]:
+        """Check out a client for the duration of a `with` block.
+
+        The client is discarded instead of returned if the block raises.
+        """
+        client = self.checkout(api_key)
+        try:
+            yield client
+        except Exception:
+            self.discard(api_key, client)
+            raise
+        self.checkin(api_key, client)
+
+    def evict_idle(self) -> int:
+        """Drop clients idle for longer than `idle_timeout`, returning how many were dropped."""
+        cutoff = self.clock() - self.idle_timeout
+        evicted: list[PaymentService] = []
+        with self._condition:
+            for api_key, idle in self._idle.items():
+                # Idle clients are ordered by return time, oldest on the left.
+                while idle and idle[0].returned_at < cutoff:
+                    evicted.append(idle.popleft().client)
+                    self._sizes[api_key] -= 1
+            self._condition.notify_all()
+        for client in evicted:
+            close_client(client)
+        return len(evicted)
+
+
+@dataclass
+class PooledPaymentService:
+    """A PaymentService that runs every call on a client leased from a shared pool."""
+
+    pool: PaymentClientPool
+    api_key: str
+
+    def set_api_key(self, api_key: str) -> None:
+        self.api_key = api_key
+
+    def process_payment(self, amount: Decimal) -> None:
+        with self.pool.lease(self.api_key) as client:
+            client.process_payment(amount)
+
+    def process_payout(self, amount: Decimal) -> None:
+        with self.pool.lease(self.api_key) as client:
+            client.process_payout(amount)
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        with self.pool.lease(self.api_key) as client:
+            client.process_payments(amounts)
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        with self.pool.lease(self.api_key) as client:
+            client.process_payouts(amounts)
@@ -0,0 +1,67 @@
+import asyncio
+from decimal import Decimal
+from typing import Iterable
+
+from design_challenge.day3.after.bank import (
+    AsyncPaymentService,
+    TransactionType,
+    deposit_async,
+    withdraw_async,
+)
+from design_challenge.day3.after.batching import PendingTransaction
+
+DEFAULT_CONCURRENCY = 100
+
+
+class _LimitedPaymentService:
+    """Wraps an AsyncPaymentService so at most `semaphore`'s value of calls run at once."""
+
+    def __init__(self, payment_service: AsyncPaymentService, semaphore: asyncio.Semaphore):
+        self.payment_service = payment_service
+        self.semaphore = semaphore
+
+    def set_api_key(self, api_key: str) -> None:
+        self.payment_service.set_api_key(api_key)
+
+    async def process_payment(self, amount: Decimal) -> None:
+        async with self.semaphore:
+            await self.payment_service.process_payment(amount)
+
+    async def process_payout(self, amount: Decimal) -> None:
+        async with self.semaphore:
+            await self.payment_service.process_payout(amount)
+
+
+async def _settle_account(
+    transactions: list[PendingTransaction], payment_service: AsyncPaymentService
+) -> None:
+    for transaction in transactions:
+        if transaction.type == TransactionType.DEPOSIT:
+            await deposit_async(transaction.amount, transaction.account, payment_service)
+        else:
+            await withdraw_async(transaction.amount, transaction.account, payment_service)
+
+
+async def settle(
+    transactions: Iterable[PendingTransaction],
+    payment_service: AsyncPaymentService,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
+    """Settle transactions concurrently, with at most `concurrency` provider calls in flight.
+
+    Different accounts settle in parallel, while each account's transactions run
+    one after another in the order given. A failure cancels the settlements still
+    running and is raised in an ExceptionGroup.
+    """
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+
+    by_account: dict[int, list[PendingTransaction]] = {}
+    for transaction in transactions:
+        # Keyed by identity: Account is a dataclass and thus unhashable.
+        by_account.setdefault(id(transaction.account), []).append(transaction)
+
+    limited_service = _LimitedPaymentService(payment_service, asyncio.Semaphore(concurrency))
+    async with asyncio.TaskGroup() as group:
+        for account_transactions in by_account.values():
+            group.create_task(_settle_account(account_transactions, limited_service))
@@ -1,17 +1,67 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Sequence
+
+from design_challenge.day3.after.events import PRINT_SINK, Event, EventSink
 
 
 @dataclass
 class StripePaymentService:
     api_key: str | None = None
+    events: EventSink = field(default=PRINT_SINK, repr=False, compare=False)
 
     def set_api_key(self, api_key: str) -> None:
-        print(f"Setting Stripe API key to {api_key}.")
+        self.events.emit(
+            Event("set_api_key", "Setting Stripe API key to {api_key}.", {"api_key": api_key})
+        )
         self.api_key = api_key
 
     def process_payment(self, amount: Decimal) -> None:
-        print(f"Processing payment of {amount} via Stripe.")
+        self.events.emit(
+            Event("payment", "Processing payment of {amount} via Stripe.", {"amount": amount})
+        )
 
     def process_payout(self, amount: Decimal) -> None:
-        print(f"Processing payout of {amount} via Stripe.")
+        self.events.emit(
+            Event("payout", "Processing payout of {amount} via Stripe.", {"amount": amount})
+        )
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        self.events.emit(
+            Event(
+                "payments",
+                "Processing batch of {count} payments totalling {total} via Stripe.",
+                {"count": len(amounts), "total": sum(amounts)},
+            )
+        )
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        self.events.emit(
+            Event(
+                "payouts",
+                "Processing batch of {count} payouts totalling {total} via Stripe.",
+                {"count": len(amounts), "total": sum(amounts)},
+            )
+        )
+
+
+@dataclass
+class AsyncStripePaymentService:
+    api_key: str | None = None
+    events: EventSink = field(default=PRINT_SINK, repr=False, compare=False)
+
+    def set_api_key(self, api_key: str) -> None:
+        self.events.emit(
+            Event("set_api_key", "Setting Stripe API key to {api_key}.", {"api_key": api_key})
+        )
+        self.api_key = api_key
+
+    async def process_payment(self, amount: Decimal) -> None:
+        self.events.emit(
+            Event("payment", "Processing payment of {amount} via Stripe.", {"amount": amount})
+        )
+
+    async def process_payout(self, amount: Decimal) -> None:
+        self.events.emit(
+            Event("payout", "Processing payout of {amount} via Stripe.", {"amount": amount})
+        )
@@ -0,0 +1,123 @@
+from design_challenge.day3.after.bank import Account, AccountType
+from design_challenge.day3.after.batching import PaymentBatcher
+from decimal import Decimal
+from typing import Sequence
+import pytest
+
+
+class RecordingPaymentService:
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, list[Decimal]]] = []
+
+    def set_api_key(self, api_key: str) -> None:
+        pass
+
+    def process_payment(self, amount: Decimal) -> None:
+        self.batches.append(("payments", [amount]))
+
+    def process_payout(self, amount: Decimal) -> None:
+        self.batches.append(("payouts", [amount]))
+
+    def process_payments(self, amounts: Sequence[Decimal]) -> None:
+        self.batches.append(("payments", list(amounts)))
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        self.batches.append(("payouts", list(amounts)))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def account() -> Account:
+    return Account("SA001", Decimal("1000"), AccountType.SAVINGS)
+
+
+def test_flush_by_size(account):
+    service = RecordingPaymentService()
+    batcher = PaymentBatcher(service, max_batch_size=3)
+    for _ in range(7):
+        batcher.deposit(Decimal("10"), account)
+
+    assert [len(amounts) for _, amounts in service.batches] == [3, 3]
+    assert account.balance == Decimal("1060")
+    batcher.flush()
+    assert account.balance == Decimal("1070")
+
+
+def test_flush_by_time_window(account):
+    service = RecordingPaymentService()
+    clock = FakeClock()
+    batcher = PaymentBatcher(service, max_batch_size=100, max_delay=1.0, clock=clock)
+    batcher.deposit(Decimal("10"), account)
+    clock.now = 0.5
+    batcher.withdraw(Decimal("5"), account)
+    assert service.batches == []
+
+    clock.now = 1.0
+    batcher.deposit(Decimal("1"), account)
+    assert service.batches == [
+        ("payments", [Decimal("10"), Decimal("1")]),
+        ("payouts", [Decimal("5")]),
+    ]
+    assert account.balance == Decimal("1006")
+
+
+def test_context_manager_flushes_remaining(account):
+    service = RecordingPaymentService()
+    with PaymentBatcher(service) as batcher:
+        batcher.withdraw(Decimal("100"), account)
+    assert service.batches == [("payouts", [Decimal("100")])]
+    assert account.balance == Decimal("900")
+
+
+class FailingPayoutService(RecordingPaymentService):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def process_payouts(self, amounts: Sequence[Decimal]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Payout provider unavailable")
+        super().process_payouts(amounts)
+
+
+def test_provider_failure_keeps_unaccepted_transactions(account):
+    service = FailingPayoutService(failures=1)
+    batcher = PaymentBatcher(service)
+    batcher.deposit(Decimal("5"), account)
+    batcher.withdraw(Decimal("20"), account)
+
+    with pytest.raises(ConnectionError):
+        batcher.flush()
+    # The accepted deposit is applied; the rejected withdrawal is still pending.
+    assert service.batches == [("payments", [Decimal("5")])]
+    assert account.balance == Decimal("1005")
+    assert [t.amount for t in batcher.pending] == [Decimal("20")]
+
+    batcher.flush()
+    assert service.batches == [("payments", [Decimal("5")]), ("payouts", [Decimal("20")])]
+    assert account.balance == Decimal("985")
+    assert batcher.pending == []
+
+
+def test_context_manager_does_not_flush_after_error(account):
+    service = RecordingPaymentService()
+    with pytest.raises(RuntimeError):
+        with PaymentBatcher(service) as batcher:
+            batcher.deposit(Decimal("10"), account)
+            raise RuntimeError("Aborted")
+    assert service.batches == []
+    assert len(batcher.pending) == 1
+    assert account.balance == Decimal("1000")
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        PaymentBatcher(RecordingPaymentService(), max_batch_size=0)
@@ -0,0 +1,47 @@
+from design_challenge.day3.after.bank import Account, AccountType
+from design_challenge.day3.after.events import NULL_SINK, Event, QueueSink
+from design_challenge.day3.after.stripe_service import StripePaymentService
+from decimal import Decimal
+import io
+
+
+class RecordingSink:
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+
+    def emit(self, event: Event) -> None:
+        self.events.append(event)
+
+
+def test_account_emits_structured_events():
+    sink = RecordingSink()
+    account = Account("SA001", Decimal("1000"), AccountType.SAVINGS, sink)
+    account.deposit(Decimal("200"))
+    account.withdraw(Decimal("50"))
+
+    assert [event.name for event in sink.events] == ["deposit", "withdrawal"]
+    assert sink.events[0].fields["amount"] == Decimal("200")
+    assert sink.events[0].message == "Depositing 200 into Savings Account SA001."
+    assert sink.events[1].message == "Withdrawing 50 from Savings Account SA001."
+
+
+def test_default_sink_prints(capsys):
+    StripePaymentService().process_payment(Decimal("12.50"))
+    assert capsys.readouterr().out == "Processing payment of 12.50 via Stripe.\n"
+
+
+def test_null_sink_is_silent(capsys):
+    account = Account("SA001", Decimal("1000"), AccountType.SAVINGS, NULL_SINK)
+    account.deposit(Decimal("1"))
+    assert capsys.readouterr().out == ""
+    assert account.balance == Decimal("1001")
+
+
+def test_queue_sink_writes_all_events_in_order():
+    stream = io.StringIO()
+    with QueueSink(stream, batch_size=7) as sink:
+        service = StripePaymentService(events=sink)
+        for amount in range(100):
+            service.process_payout(Decimal(amount))
+    expected = "".join(f"Processing payout of {amount} via Stripe.\n" for amount in range(100))
+    assert stream.getvalue() == expected
@@ -0,0 +1,56 @@
+from design_challenge.day3.after.bank import Account, AccountType, deposit, withdraw
+from design_challenge.day3.after.journal import JOURNAL_FILE, Journal, recover, restore
+from design_challenge.day3.tests.test_batching import RecordingPaymentService
+from decimal import Decimal
+import pytest
+
+
+def create_accounts() -> dict[str, Account]:
+    return {
+        "SA001": Account("SA001", Decimal("1000"), AccountType.SAVINGS),
+        "CA001": Account("CA001", Decimal("500"), AccountType.CHECKING),
+    }
+
+
+def run_transactions(journal: Journal, accounts: dict[str, Account], count: int) -> None:
+    service = RecordingPaymentService()
+    for _ in range(count):
+        deposit(Decimal("2.50"), accounts["SA001"], service, journal)
+        withdraw(Decimal("1.25"), accounts["CA001"], service, journal)
+
+
+def balances(accounts: dict[str, Account]) -> dict[str, Decimal]:
+    return {number: account.balance for number, account in accounts.items()}
+
+
+@pytest.mark.parametrize("snapshot_every", [7, 1000])
+def test_recover_after_close(tmp_path, snapshot_every):
+    accounts = create_accounts()
+    with Journal(tmp_path, accounts, group_size=4, snapshot_every=snapshot_every) as journal:
+        run_transactions(journal, accounts, 50)
+    assert recover(tmp_path) == balances(accounts)
+
+
+def test_uncommitted_group_is_lost_on_crash(tmp_path):
+    accounts = create_accounts()
+    journal = Journal(tmp_path, accounts, group_size=4)
+    run_transactions(journal, accounts, 3)  # 6 records: one group of 4 committed
+    assert recover(tmp_path) == {"SA001": Decimal("1005.00"), "CA001": Decimal("497.50")}
+
+
+def test_torn_record_is_ignored_and_truncated(tmp_path):
+    accounts = create_accounts()
+    with Journal(tmp_path, accounts, group_size=1) as journal:
+        run_transactions(journal, accounts, 2)
+    expected = balances(accounts)
+
+    with open(tmp_path / JOURNAL_FILE, "ab") as file:
+        file.write(b"\x00\x01\x02")
+    assert recover(tmp_path) == expected
+
+    recovered = create_accounts()
+    restore(recovered.values(), tmp_path)
+    with Journal(tmp_path, recovered, group_size=1) as journal:
+        run_transactions(journal, recovered, 1)
+    assert recover(tmp_path) == balances(recovered)
+    assert recovered["SA001"].balance == Decimal("1007.50")
@@ -0,0 +1,62 @@
+from design_challenge.day3.after.bank import Account, AccountType
+from design_challenge.day3.after.ledger import AccountNotFoundException, Ledger
+from decimal import Decimal
+import random
+import threading
+import pytest
+
+THREADS = 8
+OPERATIONS = 2_000
+
+
+def create_ledger(stripes: int, accounts: int = 50) -> Ledger:
+    ledger = Ledger(stripes=stripes)
+    ledger.add_accounts(
+        Account(f"CA{i:03}", Decimal("100.00"), AccountType.CHECKING) for i in range(accounts)
+    )
+    return ledger
+
+
+def run_threads(target) -> None:
+    threads = [threading.Thread(target=target, args=(seed,)) for seed in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.parametrize("stripes", [1, 4, 64])
+def test_concurrent_transfers_conserve_balance(stripes):
+    ledger = create_ledger(stripes)
+    numbers = [account.account_number for account in ledger]
+    opening_total = ledger.total()
+
+    def transfer_randomly(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(OPERATIONS):
+            source, target = rng.sample(numbers, 2)
+            ledger.transfer(source, target, Decimal(rng.randrange(1, 500)) / 100)
+
+    run_threads(transfer_randomly)
+    assert ledger.total() == opening_total
+
+
+def test_concurrent_deposits_to_one_account_are_exact():
+    ledger = create_ledger(stripes=16, accounts=1)
+
+    def deposit_cents(seed: int) -> None:
+        for _ in range(OPERATIONS):
+            ledger.deposit("CA000", Decimal("0.01"))
+
+    run_threads(deposit_cents)
+    assert ledger.balance("CA000") == Decimal("100.00") + THREADS * OPERATIONS * Decimal("0.01")
+
+
+def test_unknown_account():
+    with pytest.raises(AccountNotFoundException):
+        create_ledger(stripes=4).deposit("XX999", Decimal("1"))
+
+
+def test_invalid_stripes():
+    with pytest.raises(ValueError):
+        Ledger(stripes=0)
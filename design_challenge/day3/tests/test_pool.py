@@ -0,0 +1,124 @@
+from design_challenge.day3.after.pool import (
+    PaymentClientPool,
+    PoolExhaustedException,
+    PooledPaymentService,
+)
+from design_challenge.day3.tests.test_batching import FakeClock, RecordingPaymentService
+from decimal import Decimal
+import threading
+import pytest
+
+
+class ClosableClient(RecordingPaymentService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class CountingFactory:
+    def __init__(self) -> None:
+        self.created: list[ClosableClient] = []
+
+    def __call__(self, api_key: str) -> ClosableClient:
+        client = ClosableClient()
+        self.created.append(client)
+        return client
+
+
+def test_clients_are_reused():
+    factory = CountingFactory()
+    service = PooledPaymentService(PaymentClientPool(client_factory=factory), "sk_test_1")
+    for _ in range(100):
+        service.process_payment(Decimal("1"))
+    assert len(factory.created) == 1
+    assert len(factory.created[0].batches) == 100
+
+
+def test_clients_are_kept_per_api_key():
+    factory = CountingFactory()
+    pool = PaymentClientPool(client_factory=factory)
+    with pool.lease("sk_test_1") as first:
+        pass
+    with pool.lease("sk_test_2") as second:
+        pass
+    assert first is not second
+    with pool.lease("sk_test_1") as again:
+        assert again is first
+
+
+def test_pool_is_bounded():
+    pool = PaymentClientPool(
+        client_factory=CountingFactory(), max_clients_per_key=2, checkout_timeout=0.01
+    )
+    pool.checkout("sk_test_1")
+    pool.checkout("sk_test_1")
+    with pytest.raises(PoolExhaustedException):
+        pool.checkout("sk_test_1")
+    assert pool.size("sk_test_1") == 2
+
+
+def test_unhealthy_clients_are_replaced():
+    factory = CountingFactory()
+    broken: set[int] = set()
+    pool = PaymentClientPool(
+        client_factory=factory, health_check=lambda client: id(client) not in broken
+    )
+    with pool.lease("sk_test_1") as client:
+        broken.add(id(client))
+    with pool.lease("sk_test_1") as replacement:
+        assert replacement is not client
+    assert pool.size("sk_test_1") == 1
+    assert client.closed
+    assert not replacement.closed
+
+
+def test_health_check_does_not_block_other_keys():
+    checking = threading.Event()
+    release = threading.Event()
+
+    def slow_health_check(client) -> bool:
+        checking.set()
+        release.wait(timeout=5)
+        return True
+
+    pool = PaymentClientPool(client_factory=CountingFactory(), health_check=slow_health_check)
+    pool.checkin("sk_test_1", pool.checkout("sk_test_1"))
+    checker = threading.Thread(target=pool.checkout, args=("sk_test_1",))
+    checker.start()
+    try:
+        assert checking.wait(timeout=5)
+        # The slow check for one key must not hold the lock other keys need.
+        pool.checkin("sk_test_2", pool.checkout("sk_test_2"))
+        assert pool.size("sk_test_2") == 1
+    finally:
+        release.set()
+        checker.join()
+
+
+def test_failed_lease_frees_the_slot():
+    pool = PaymentClientPool(
+        client_factory=CountingFactory(), max_clients_per_key=1, checkout_timeout=0.01
+    )
+    with pytest.raises(RuntimeError), pool.lease("sk_test_1") as client:
+        raise RuntimeError("connection reset")
+    assert client.closed
+    with pool.lease("sk_test_1"):
+        pass
+
+
+def test_idle_eviction():
+    clock = FakeClock()
+    pool = PaymentClientPool(client_factory=CountingFactory(), idle_timeout=10, clock=clock)
+    first = pool.checkout("sk_test_1")
+    second = pool.checkout("sk_test_1")
+    pool.checkin("sk_test_1", first)
+    clock.now = 8
+    pool.checkin("sk_test_1", second)
+    clock.now = 15
+    assert pool.evict_idle() == 1
+    assert pool.size("sk_test_1") == 1
+    assert first.closed
+    assert not second.closed
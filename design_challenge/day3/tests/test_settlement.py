@@ -0,0 +1,68 @@
+from design_challenge.day3.after.bank import Account, AccountType, TransactionType
+from design_challenge.day3.after.batching import PendingTransaction
+from design_challenge.day3.after.settlement import settle
+from decimal import Decimal
+import asyncio
+import random
+import pytest
+
+
+class FakeAsyncProvider:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    def set_api_key(self, api_key: str) -> None:
+        pass
+
+    async def _call(self) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(random.uniform(0, 0.002))
+        self.in_flight -= 1
+
+    async def process_payment(self, amount: Decimal) -> None:
+        await self._call()
+
+    async def process_payout(self, amount: Decimal) -> None:
+        await self._call()
+
+
+class RecordingAccount(Account):
+    def __init__(self, account_number: str) -> None:
+        super().__init__(account_number, Decimal("0"), AccountType.CHECKING)
+        self.history: list[Decimal] = []
+
+    def deposit(self, amount: Decimal) -> None:
+        self.history.append(amount)
+        self.balance += amount
+
+    def withdraw(self, amount: Decimal) -> None:
+        self.history.append(-amount)
+        self.balance -= amount
+
+
+def test_settle_preserves_per_account_order_and_limits_concurrency():
+    accounts = [RecordingAccount(f"CA{i:03}") for i in range(50)]
+    transactions = [
+        PendingTransaction(
+            TransactionType.DEPOSIT if step % 3 else TransactionType.WITHDRAWAL,
+            Decimal(step + 1),
+            account,
+        )
+        for step in range(10)
+        for account in accounts
+    ]
+    provider = FakeAsyncProvider()
+    asyncio.run(settle(transactions, provider, concurrency=8))
+
+    expected = [Decimal(step + 1) if step % 3 else -Decimal(step + 1) for step in range(10)]
+    for account in accounts:
+        assert account.history == expected
+        assert account.balance == sum(expected)
+    assert provider.peak == 8
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(settle([], FakeAsyncProvider(), concurrency=0))
@@ -0,0 +1,185 @@
+import contextlib
+import io
+import time
+from decimal import Decimal
+
+from design_challenge.day4.after_tomaluuk import (
+    Item,
+    Order,
+    OrderType,
+    calculate_price,
+    process_order,
+)
+from design_challenge.day4.after_tomaluuk_2 import (
+    calculate_discounted_price,
+    generate_order_confirmation_email,
+    generate_order_shipping_notification,
+)
+from design_challenge.day4.bulk import process_orders
+from design_challenge.day4.mail import MailDispatcher, to_message
+from design_challenge.day4.outbox import Outbox
+from design_challenge.day4.pricing import PriceAggregate
+from design_challenge.day4.templates import ORDER_CONFIRMATION, ORDER_SHIPPED, render_order_emails
+
+ORDERS = 10**6
+# process_order prints several lines per order, so only time a sample of it.
+SINGLE_ORDERS = 10**5
+MAILS = 2_000
+# Simulated cost of opening an SMTP connection (TCP + TLS + EHLO) and of sending one message.
+CONNECT_LATENCY = 0.002
+SEND_LATENCY = 0.0002
+REPLAYS = 5
+PRICED_ITEMS = 10_000
+DISCOUNT_QUERIES = 1_000
+
+
+def create_orders(count: int) -> list[Order]:
+    """Two online orders for every in-store order."""
+    return [
+        Order(
+            id=i,
+            type=OrderType.IN_STORE if i % 3 == 0 else OrderType.ONLINE,
+            customer_email=f"customer{i}@gmail.com",
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark_bulk_processing() -> None:
+    orders = create_orders(SINGLE_ORDERS)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for order in orders:
+            process_order(order)
+    single = (time.perf_counter() - start) / SINGLE_ORDERS
+    print(f"process_order one at a time: {single * 1e6:.2f} us/order")
+
+    orders = create_orders(ORDERS)
+    start = time.perf_counter()
+    reports = process_orders(orders, batch_size=100_000)
+    bulk = (time.perf_counter() - start) / ORDERS
+    print(f"process_orders in bulk:      {bulk * 1e6:.2f} us/order ({ORDERS} orders)")
+    for report in reports:
+        print(f"  {report}")
+
+
+def benchmark_email_rendering() -> None:
+    orders = create_orders(ORDERS)
+    print(f"\nRendering {ORDERS} confirmation + {ORDERS} shipping emails:")
+
+    start = time.perf_counter()
+    confirmations = [generate_order_confirmation_email(order) for order in orders]
+    notifications = [generate_order_shipping_notification(order) for order in orders]
+    elapsed = time.perf_counter() - start
+    print(f"{'generate_* functions':<24}{elapsed:>8.3f}s")
+    del confirmations, notifications
+
+    start = time.perf_counter()
+    confirmations = ORDER_CONFIRMATION.render_batch(orders)
+    notifications = ORDER_SHIPPED.render_batch(orders)
+    elapsed = time.perf_counter() - start
+    print(f"{'compiled batch render':<24}{elapsed:>8.3f}s")
+    del confirmations, notifications
+
+
+class SlowSMTPConnection:
+    """A no-network SMTP stand-in that sleeps to simulate connect and send latency."""
+
+    def __init__(self) -> None:
+        time.sleep(CONNECT_LATENCY)
+
+    def send_message(self, msg) -> dict:
+        time.sleep(SEND_LATENCY)
+        return {}
+
+    def quit(self) -> tuple[int, bytes]:
+        return 221, b"Bye"
+
+
+def benchmark_mail_dispatch() -> None:
+    emails = list(ORDER_CONFIRMATION.render_batch(create_orders(MAILS)))
+    print(f"\nSending {MAILS} emails:")
+
+    start = time.perf_counter()
+    for email in emails:
+        connection = SlowSMTPConnection()
+        connection.send_message(to_message(email))
+        connection.quit()
+    elapsed = time.perf_counter() - start
+    print(f"{'connection per email':<24}{elapsed:>8.3f}s")
+
+    for pool_size in (1, 4):
+        dispatcher = MailDispatcher(SlowSMTPConnection, pool_size=pool_size)
+        dispatcher.enqueue_all(emails)
+        start = time.perf_counter()
+        with dispatcher:
+            pass
+        elapsed = time.perf_counter() - start
+        metrics = dispatcher.metrics
+        print(
+            f"{f'dispatcher, pool of {pool_size}':<24}{elapsed:>8.3f}s"
+            f"  p50 {metrics.latency_percentile(50) * 1000:.2f} ms"
+            f"  p99 {metrics.latency_percentile(99) * 1000:.2f} ms"
+        )
+
+
+def benchmark_replay_dedup() -> None:
+    orders = create_orders(ORDERS // 10)
+    process_orders(orders)
+    print(f"\nQueueing emails for {len(orders)} orders replayed {REPLAYS} times:")
+
+    dispatcher = MailDispatcher(SlowSMTPConnection)
+    start = time.perf_counter()
+    for _ in range(REPLAYS):
+        for batch in render_order_emails(orders).values():
+            dispatcher.enqueue_all(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{'render every replay':<24}{elapsed:>8.3f}s  {dispatcher.queue_depth} queued")
+
+    dispatcher = MailDispatcher(SlowSMTPConnection)
+    outbox = Outbox(dispatcher)
+    start = time.perf_counter()
+    for _ in range(REPLAYS):
+        outbox.submit(orders)
+    elapsed = time.perf_counter() - start
+    print(f"{'deduplicating outbox':<24}{elapsed:>8.3f}s  {dispatcher.queue_depth} queued")
+
+
+def benchmark_discount_queries() -> None:
+    items = [Item(f"item{i}", Decimal(i % 10_000 + 1).scaleb(-2)) for i in range(PRICED_ITEMS)]
+    discounts = [Decimal(i % 100).scaleb(-2) for i in range(DISCOUNT_QUERIES)]
+    print(f"\n{DISCOUNT_QUERIES} discount queries over {PRICED_ITEMS} items:")
+
+    for name, calculate in (
+        ("calculate_price", calculate_price),
+        ("calculate_discounted_price", calculate_discounted_price),
+    ):
+        start = time.perf_counter()
+        for discount in discounts:
+            calculate(items, discount)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28}{elapsed * 1e6 / DISCOUNT_QUERIES:>10.2f} us/query")
+
+    start = time.perf_counter()
+    aggregate = PriceAggregate(items)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    for discount in discounts:
+        aggregate.discounted(discount)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'PriceAggregate.discounted':<28}{elapsed * 1e6 / DISCOUNT_QUERIES:>10.2f} us/query"
+        f" (built once in {built * 1000:.2f} ms)"
+    )
+
+
+def main() -> None:
+    benchmark_bulk_processing()
+    benchmark_email_rendering()
+    benchmark_mail_dispatch()
+    benchmark_replay_dedup()
+    benchmark_discount_queries()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from design_challenge.day4.after_tomaluuk import Order, OrderStatus, OrderType
+
+DEFAULT_BATCH_SIZE = 10_000
+
+OrderHandler = Callable[[list[Order]], None]
+
+
+@dataclass
+class BatchReport:
+    order_type: OrderType
+    size: int
+    seconds: float
+
+    def __str__(self) -> str:
+        return f"{self.order_type:<10}{self.size:>8} orders{self.seconds * 1000:>10.2f} ms"
+
+
+def set_status(orders: Iterable[Order], status: OrderStatus) -> None:
+    for order in orders:
+        order.status = status
+
+
+def process_online_orders(orders: list[Order]) -> None:
+    # Logic to ship a batch of online orders
+    set_status(orders, OrderStatus.CONFIRMED)
+
+
+def process_in_store_orders(orders: list[Order]) -> None:
+    # Logic to ready a batch of in-store orders for pickup
+    set_status(orders, OrderStatus.SHIPPED)
+
+
+ORDER_HANDLERS: dict[OrderType, OrderHandler] = {
+    OrderType.ONLINE: process_online_orders,
+    OrderType.IN_STORE: process_in_store_orders,
+}
+
+
+def process_orders(
+    orders: Iterable[Order],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    handlers: dict[OrderType, OrderHandler] | None = None,
+) -> list[BatchReport]:
+    """Group a stream of orders by type and hand them to their handler `batch_size` at a time.
+
+    Only one pending batch per order type is held in memory. Returns a report per
+    dispatched batch, in dispatch order.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    handlers = ORDER_HANDLERS if handlers is None else handlers
+
+    reports: list[BatchReport] = []
+    pending: dict[OrderType, list[Order]] = {order_type: [] for order_type in handlers}
+
+    def dispatch(order_type: OrderType) -> None:
+        batch = pending[order_type]
+        pending[order_type] = []
+        start = time.perf_counter()
+        handlers[order_type](batch)
+        reports.append(BatchReport(order_type, len(batch), time.perf_counter() - start))
+
+    for order in orders:
+        try:
+            batch = pending[order.type]
+        except KeyError:
+            raise ValueError(f"No handler for {order.type} orders.") from None
+        batch.append(order)
+        if len(batch) >= batch_size:
+            dispatch(order.type)
+
+    for order_type, batch in pending.items():
+        if batch:
+            dispatch(order_type)
+
+    return reports
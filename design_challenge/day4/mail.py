@@ -0,0 +1,234 @@
+import smtplib
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Callable, Iterable, Protocol
+
+from design_challenge.day4.after_tomaluuk import Email
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_BATCH_SIZE = 100
+LATENCY_SAMPLES = 10_000
+
+# Errors after which the connection is not trusted anymore and gets replaced.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+
+
+class SMTPConnection(Protocol):
+    def send_message(self, msg: EmailMessage) -> dict:
+        ...
+
+    def quit(self) -> tuple[int, bytes]:
+        ...
+
+
+def is_transient(error: smtplib.SMTPException) -> bool:
+    """Whether the server refused with a 4xx code, so sending again later may succeed."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    return False
+
+
+def to_message(email: Email) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = email.sender
+    message["To"] = email.recipient
+    message["Subject"] = email.subject
+    message.set_content(email.body)
+    return message
+
+
+@dataclass
+class MailMetrics:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    connections_opened: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Send latency in seconds at `percentile` (0-100) over the most recent sends."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+class MailDispatcher:
+    """Queues emails and sends them over a bounded pool of reused SMTP connections.
+
+    `flush` coalesces the queue into batches of up to `batch_size` emails per
+    sender, and sends each batch over one pooled connection, up to `pool_size`
+    batches at a time. A send failing with a connection error or a 4xx refusal is
+    retried up to `max_retries` times, waiting `backoff * 2**attempt` seconds in
+    between; emails that still fail, or are refused permanently, end up in
+    `dead_letters`. Callables in `on_sent` and `on_failed` are called with each
+    email once it is delivered or dead-lettered, from the sending thread.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], SMTPConnection],
+        pool_size: int = DEFAULT_POOL_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if pool_size <= 0 or batch_size <= 0:
+            raise ValueError(
+                f"pool_size and batch_size must be positive, got {pool_size} and {batch_size}"
+            )
+        self.connection_factory = connection_factory
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.metrics = MailMetrics()
+        self.dead_letters: list[Email] = []
+        self.on_sent: list[Callable[[Email], None]] = []
+        self.on_failed: list[Callable[[Email], None]] = []
+        self._queue: deque[Email] = deque()
+        self._idle: list[SMTPConnection] = []
+        self._opened = 0
+        self._lock = threading.Lock()
+        # Notified whenever a connection is returned or a slot for a new one frees up.
+        self._available = threading.Condition(self._lock)
+
+    def __enter__(self) -> "MailDispatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+        self.close()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, email: Email) -> None:
+        self._queue.append(email)
+
+    def enqueue_all(self, emails: Iterable[Email]) -> None:
+        self._queue.extend(emails)
+
+    def flush(self) -> None:
+        """Send every queued email, returning once all have been sent or dead-lettered."""
+        by_sender: dict[str, list[Email]] = {}
+        while self._queue:
+            email = self._queue.popleft()
+            by_sender.setdefault(email.sender, []).append(email)
+
+        batches = [
+            emails[start : start + self.batch_size]
+            for emails in by_sender.values()
+            for start in range(0, len(emails), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            # list() re-raises anything unexpected from the workers.
+            list(executor.map(self._send_batch, batches))
+
+    def close(self) -> None:
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._available.notify_all()
+        for connection in idle:
+            try:
+                connection.quit()
+            except CONNECTION_ERRORS + (smtplib.SMTPException,):
+                pass
+
+    def _checkout(self) -> SMTPConnection:
+        with self._available:
+            while not self._idle and self._opened >= self.pool_size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+        try:
+            connection = self.connection_factory()
+        except Exception:
+            self._release_slot()
+            raise
+        with self._lock:
+            self.metrics.connections_opened += 1
+        return connection
+
+    def _checkin(self, connection: SMTPConnection) -> None:
+        with self._available:
+            self._idle.append(connection)
+            self._available.notify()
+
+    def _release_slot(self) -> None:
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+
+    def _discard(self, connection: SMTPConnection) -> None:
+        self._release_slot()
+        try:
+            connection.quit()
+        except CONNECTION_ERRORS + (smtplib.SMTPException,):
+            pass
+
+    def _discard_if_open(self, connection: SMTPConnection | None) -> None:
+        if connection is not None:
+            self._discard(connection)
+
+    def _send_batch(self, batch: list[Email]) -> None:
+        # Checked out lazily by the first send, so a failing connect is retried too.
+        connection: SMTPConnection | None = None
+        try:
+            for email in batch:
+                connection = self._send_with_retries(connection, email)
+        finally:
+            if connection is not None:
+                self._checkin(connection)
+
+    def _send_with_retries(
+        self, connection: SMTPConnection | None, email: Email
+    ) -> SMTPConnection | None:
+        message = to_message(email)
+        for attempt in range(self.max_retries + 1):
+            try:
+                if connection is None:
+                    connection = self._checkout()
+                start = time.perf_counter()
+                connection.send_message(message)
+            except smtplib.SMTPException as error:
+                # SMTPException subclasses OSError, so refusals are told apart first.
+                if isinstance(error, smtplib.SMTPServerDisconnected):
+                    self._discard_if_open(connection)
+                    connection = None
+                elif not is_transient(error):
+                    break
+            except OSError:
+                self._discard_if_open(connection)
+                connection = None
+            else:
+                with self._lock:
+                    self.metrics.sent += 1
+                    self.metrics.latencies.append(time.perf_counter() - start)
+                for callback in self.on_sent:
+                    callback(email)
+                return connection
+
+            if attempt < self.max_retries:
+                with self._lock:
+                    self.metrics.retries += 1
+                self.sleep(self.backoff * 2**attempt)
+
+        with self._lock:
+            self.metrics.failed += 1
+            self.dead_letters.append(email)
+        for callback in self.on_failed:
+            callback(email)
+        return connection
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from design_challenge.day4.after_tomaluuk import Email, Order, OrderStatus
+from design_challenge.day4.mail import MailDispatcher
+from design_challenge.day4.templates import TEMPLATES_BY_STATUS, render_order_emails
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 24 * 60 * 60
+
+Fingerprint = tuple[str, str, int, OrderStatus]
+
+
+def fingerprint(order: Order) -> Fingerprint:
+    """Identifies the email an order gets in its current status, without rendering it."""
+    subject = TEMPLATES_BY_STATUS[order.status].subject
+    return order.customer_email, subject, order.id, order.status
+
+
+class DedupIndex:
+    """Remembers fingerprints for `ttl` seconds, holding at most `max_entries` of them.
+
+    Entries are kept in insertion order, which with a fixed ttl is also expiry
+    order, so expired and overflowing entries are both dropped from the front.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._expires_at: OrderedDict[Fingerprint, float] = OrderedDict()
+        # Expiry of the oldest entry, so most adds skip looking for expired entries.
+        self._next_expiry = float("inf")
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def __contains__(self, key: Fingerprint) -> bool:
+        now = self.clock()
+        if now >= self._next_expiry:
+            self._expire(now)
+        return key in self._expires_at
+
+    def add(self, key: Fingerprint) -> bool:
+        """Record `key`; returns False if it was already seen and has not expired yet."""
+        now = self.clock()
+        if now >= self._next_expiry:
+            self._expire(now)
+        expires_at = self._expires_at
+        if key in expires_at:
+            return False
+        expires_at[key] = now + self.ttl
+        if len(expires_at) > self.max_entries:
+            expires_at.popitem(last=False)
+            self._next_expiry = next(iter(expires_at.values()))
+        elif len(expires_at) == 1:
+            self._next_expiry = now + self.ttl
+        return True
+
+    def _expire(self, now: float) -> None:
+        expires_at = self._expires_at
+        while expires_at:
+            key, expiry = next(iter(expires_at.items()))
+            if expiry > now:
+                self._next_expiry = expiry
+                return
+            del expires_at[key]
+        self._next_expiry = float("inf")
+
+
+class Outbox:
+    """Renders and queues order emails, dropping the ones already sent recently.
+
+    Orders are checked against the dedup index before rendering, so replaying a
+    batch of orders costs a lookup per order rather than a render and a send. An
+    email only enters the index once the dispatcher has delivered it; until then
+    it counts as in flight, so replays are still dropped, and a dead-lettered
+    email can be submitted again.
+    """
+
+    def __init__(self, dispatcher: MailDispatcher, index: DedupIndex | None = None) -> None:
+        self.dispatcher = dispatcher
+        self.index = index if index is not None else DedupIndex()
+        self.duplicates = 0
+        # id(email) -> fingerprint for queued emails; the dispatcher keeps the emails alive.
+        self._in_flight: dict[int, Fingerprint] = {}
+        self._in_flight_keys: set[Fingerprint] = set()
+        self._lock = threading.Lock()
+        dispatcher.on_sent.append(self._delivered)
+        dispatcher.on_failed.append(self._failed)
+
+    def submit(self, orders: Iterable[Order]) -> int:
+        """Queue an email for every order not emailed about in its current status yet.
+
+        Returns the number of emails queued.
+        """
+        fresh: dict[OrderStatus, list[tuple[Order, Fingerprint]]] = {}
+        queued = 0
+        with self._lock:
+            for order in orders:
+                if order.status not in TEMPLATES_BY_STATUS:
+                    continue
+                key = fingerprint(order)
+                if key in self._in_flight_keys or key in self.index:
+                    self.duplicates += 1
+                    continue
+                self._in_flight_keys.add(key)
+                fresh.setdefault(order.status, []).append((order, key))
+
+            for status, batch in render_order_emails(
+                order for pending in fresh.values() for order, _ in pending
+            ).items():
+                emails = list(batch)
+                for email, (_, key) in zip(emails, fresh[status]):
+                    self._in_flight[id(email)] = key
+                self.dispatcher.enqueue_all(emails)
+                queued += len(emails)
+        return queued
+
+    def _delivered(self, email: Email) -> None:
+        with self._lock:
+            key = self._in_flight.pop(id(email), None)
+            if key is not None:
+                self._in_flight_keys.discard(key)
+                self.index.add(key)
+
+    def _failed(self, email: Email) -> None:
+        with self._lock:
+            key = self._in_flight.pop(id(email), None)
+            if key is not None:
+                self._in_flight_keys.discard(key)
@@ -0,0 +1,49 @@
+from collections import Counter
+from decimal import Decimal
+from typing import Iterable
+
+from design_challenge.day4.after_tomaluuk import Item
+from design_challenge.money import EXACT_CONTEXT
+
+
+class PriceAggregate:
+    """The running total price of a changing set of items.
+
+    Adding or removing an item adjusts the cached total, so `total` and
+    `discounted` never re-sum the items. Results equal those of
+    `calculate_price`, `calculate_total_price` and `calculate_discounted_price`.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._counts: Counter[tuple[str, Decimal]] = Counter()
+        # Summed exactly, so removing an item leaves no rounding error behind.
+        self._total = Decimal(0)
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return self._counts.total()
+
+    @property
+    def total(self) -> Decimal:
+        # Rounded to the current context, like the sum `calculate_total_price` takes.
+        return +self._total
+
+    def add(self, item: Item) -> None:
+        self._counts[item.name, item.price] += 1
+        self._total = EXACT_CONTEXT.add(self._total, item.price)
+
+    def remove(self, item: Item) -> None:
+        key = item.name, item.price
+        count = self._counts[key]
+        if not count:
+            raise ValueError(f"{item} is not in the aggregate.")
+        if count == 1:
+            del self._counts[key]
+        else:
+            self._counts[key] = count - 1
+        self._total = EXACT_CONTEXT.subtract(self._total, item.price)
+
+    def discounted(self, discount: Decimal = Decimal(0)) -> Decimal:
+        total = self.total
+        return total - (total * discount)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from string import Formatter
+from typing import Iterable, Iterator, Sequence
+
+from design_challenge.day4.after_tomaluuk import Email, Order, OrderStatus
+from design_challenge.day4.after_tomaluuk_2 import SENDER
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    """An email body template, split once into literal text around the `{order_id}` field."""
+
+    subject: str
+    status: OrderStatus
+    prefix: str
+    suffix: str
+
+    @classmethod
+    def compile(cls, subject: str, status: OrderStatus, body: str) -> "EmailTemplate":
+        parts = list(Formatter().parse(body))
+        fields = [(field, spec, conv) for _, field, spec, conv in parts if field is not None]
+        if fields != [("order_id", "", None)]:
+            raise ValueError(f"Template body must contain exactly one {{order_id}} field: {body!r}")
+        # The field follows the literal text of its own part; escaped braces may split literals.
+        field_part = next(i for i, (_, field, _, _) in enumerate(parts) if field is not None)
+        prefix = "".join(literal for literal, _, _, _ in parts[: field_part + 1])
+        suffix = "".join(literal for literal, _, _, _ in parts[field_part + 1 :])
+        return cls(subject, status, prefix, suffix)
+
+    def render(self, order: Order) -> Email:
+        return Email(
+            body=f"{self.prefix}{order.id}{self.suffix}",
+            subject=self.subject,
+            recipient=order.customer_email,
+            sender=SENDER,
+        )
+
+    def render_batch(self, orders: Sequence[Order]) -> "EmailBatch":
+        prefix, suffix = self.prefix, self.suffix
+        return EmailBatch(
+            subject=self.subject,
+            sender=SENDER,
+            recipients=[order.customer_email for order in orders],
+            bodies=[f"{prefix}{order.id}{suffix}" for order in orders],
+        )
+
+
+class EmailBatch:
+    """Emails sharing a subject and sender, stored as columns of recipients and bodies."""
+
+    __slots__ = ("subject", "sender", "recipients", "bodies")
+
+    def __init__(self, subject: str, sender: str, recipients: list[str], bodies: list[str]) -> None:
+        self.subject = subject
+        self.sender = sender
+        self.recipients = recipients
+        self.bodies = bodies
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def __getitem__(self, index: int) -> Email:
+        return Email(self.bodies[index], self.subject, self.recipients[index], self.sender)
+
+    def __iter__(self) -> Iterator[Email]:
+        for body, recipient in zip(self.bodies, self.recipients):
+            yield Email(body, self.subject, recipient, self.sender)
+
+
+ORDER_CONFIRMATION = EmailTemplate.compile(
+    "Order Confirmation",
+    OrderStatus.CONFIRMED,
+    "Thank you for your order! Your order #{order_id} has been confirmed.",
+)
+ORDER_SHIPPED = EmailTemplate.compile(
+    "Order Shipped",
+    OrderStatus.SHIPPED,
+    "Good news! Your order #{order_id} has been shipped and is on its way.",
+)
+
+TEMPLATES: dict[tuple[str, OrderStatus], EmailTemplate] = {
+    (template.subject, template.status): template for template in (ORDER_CONFIRMATION, ORDER_SHIPPED)
+}
+TEMPLATES_BY_STATUS: dict[OrderStatus, EmailTemplate] = {
+    template.status: template for template in TEMPLATES.values()
+}
+
+
+def render_order_emails(orders: Iterable[Order]) -> dict[OrderStatus, EmailBatch]:
+    """Render the email for every order's current status, one batch per status.
+
+    Orders in a status without a template, such as IN_PROGRESS, get no email.
+    """
+    by_status: dict[OrderStatus, list[Order]] = {status: [] for status in TEMPLATES_BY_STATUS}
+    for order in orders:
+        if order.status in by_status:
+            by_status[order.status].append(order)
+    return {
+        status: TEMPLATES_BY_STATUS[status].render_batch(batch)
+        for status, batch in by_status.items()
+        if batch
+    }
@@ -0,0 +1,53 @@
+from design_challenge.day4.after_tomaluuk import Order, OrderType, process_order
+from design_challenge.day4.bulk import process_orders
+import contextlib
+import io
+import pytest
+
+
+def create_orders(count: int) -> list[Order]:
+    return [
+        Order(i, OrderType.IN_STORE if i % 3 == 0 else OrderType.ONLINE, f"customer{i}@gmail.com")
+        for i in range(count)
+    ]
+
+
+def test_statuses_match_process_order():
+    bulk_orders = create_orders(100)
+    single_orders = create_orders(100)
+    process_orders(bulk_orders, batch_size=7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for order in single_orders:
+            process_order(order)
+    assert [order.status for order in bulk_orders] == [order.status for order in single_orders]
+
+
+def test_orders_are_grouped_by_type_in_batches():
+    batches: list[tuple[OrderType, list[int]]] = []
+    handlers = {
+        order_type: lambda orders, order_type=order_type: batches.append(
+            (order_type, [order.id for order in orders])
+        )
+        for order_type in OrderType
+    }
+    reports = process_orders(create_orders(10), batch_size=3, handlers=handlers)
+
+    assert batches == [
+        (OrderType.ONLINE, [1, 2, 4]),
+        (OrderType.IN_STORE, [0, 3, 6]),
+        (OrderType.ONLINE, [5, 7, 8]),
+        (OrderType.IN_STORE, [9]),
+    ]
+    assert [(report.order_type, report.size) for report in reports] == [
+        (order_type, len(ids)) for order_type, ids in batches
+    ]
+
+
+def test_unhandled_order_type():
+    with pytest.raises(ValueError):
+        process_orders(create_orders(3), handlers={OrderType.ONLINE: lambda orders: None})
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        process_orders([], batch_size=0)
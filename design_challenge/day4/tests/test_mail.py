@@ -0,0 +1,211 @@
+import smtplib
+import threading
+from email.message import EmailMessage
+
+import pytest
+
+from design_challenge.day4.after_tomaluuk import Email, Order, OrderType
+from design_challenge.day4.mail import MailDispatcher, to_message
+from design_challenge.day4.templates import ORDER_CONFIRMATION
+
+
+class FakeSMTPServer:
+    """An in-process stand-in for an SMTP server, handing out fake connections."""
+
+    def __init__(
+        self, fail_sends: int = 0, drop_connections: int = 0, fail_code: int = 451
+    ) -> None:
+        self.messages: list[EmailMessage] = []
+        self.fail_sends = fail_sends
+        self.fail_code = fail_code
+        self.drop_connections = drop_connections
+        self.connections: list["FakeSMTPConnection"] = []
+        self.lock = threading.Lock()
+
+    def connect(self) -> "FakeSMTPConnection":
+        connection = FakeSMTPConnection(self)
+        with self.lock:
+            self.connections.append(connection)
+        return connection
+
+
+class FakeSMTPConnection:
+    def __init__(self, server: FakeSMTPServer) -> None:
+        self.server = server
+        self.sent = 0
+        self.closed = False
+
+    def send_message(self, msg: EmailMessage) -> dict:
+        server = self.server
+        with server.lock:
+            if server.drop_connections:
+                server.drop_connections -= 1
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            if server.fail_sends:
+                server.fail_sends -= 1
+                raise smtplib.SMTPRecipientsRefused({msg["To"]: (server.fail_code, b"Refused")})
+            server.messages.append(msg)
+        self.sent += 1
+        return {}
+
+    def quit(self) -> tuple[int, bytes]:
+        self.closed = True
+        return 221, b"Bye"
+
+
+def create_emails(count: int, sender: str = "shop@example.com") -> list[Email]:
+    return [Email(f"Body {i}", "Subject", f"customer{i}@example.com", sender) for i in range(count)]
+
+
+def test_to_message():
+    message = to_message(Email("Hello", "Greetings", "john@example.com", "shop@example.com"))
+    assert message["From"] == "shop@example.com"
+    assert message["To"] == "john@example.com"
+    assert message["Subject"] == "Greetings"
+    assert message.get_content() == "Hello\n"
+
+
+def test_flush_sends_every_email_over_pooled_connections():
+    server = FakeSMTPServer()
+    dispatcher = MailDispatcher(server.connect, pool_size=2, batch_size=10)
+    emails = create_emails(50) + create_emails(25, sender="support@example.com")
+    dispatcher.enqueue_all(emails)
+    assert dispatcher.queue_depth == 75
+
+    dispatcher.flush()
+
+    assert dispatcher.queue_depth == 0
+    assert sorted(message["To"] for message in server.messages) == sorted(
+        email.recipient for email in emails
+    )
+    assert dispatcher.metrics.sent == 75
+    assert len(dispatcher.metrics.latencies) == 75
+    # Eight batches share at most two connections.
+    assert 1 <= len(server.connections) <= 2
+    assert dispatcher.metrics.connections_opened == len(server.connections)
+
+
+def test_connections_are_reused_across_flushes_and_closed():
+    server = FakeSMTPServer()
+    with MailDispatcher(server.connect, pool_size=1) as dispatcher:
+        for email in create_emails(3):
+            dispatcher.enqueue(email)
+            dispatcher.flush()
+
+    assert len(server.connections) == 1
+    assert server.connections[0].sent == 3
+    assert server.connections[0].closed
+
+
+def test_rendered_batches_can_be_queued():
+    server = FakeSMTPServer()
+    orders = [Order(i, OrderType.ONLINE, f"customer{i}@gmail.com") for i in range(5)]
+    with MailDispatcher(server.connect) as dispatcher:
+        dispatcher.enqueue_all(ORDER_CONFIRMATION.render_batch(orders))
+
+    assert [message["Subject"] for message in server.messages] == ["Order Confirmation"] * 5
+
+
+def test_transient_failures_are_retried_with_backoff():
+    server = FakeSMTPServer(fail_sends=2)
+    delays: list[float] = []
+    dispatcher = MailDispatcher(server.connect, pool_size=1, backoff=0.5, sleep=delays.append)
+    dispatcher.enqueue_all(create_emails(3))
+    dispatcher.flush()
+
+    assert len(server.messages) == 3
+    assert delays == [0.5, 1.0]
+    assert dispatcher.metrics.retries == 2
+    assert dispatcher.metrics.failed == 0
+
+
+def test_dropped_connection_is_replaced():
+    server = FakeSMTPServer(drop_connections=1)
+    dispatcher = MailDispatcher(server.connect, pool_size=1, sleep=lambda _: None)
+    dispatcher.enqueue_all(create_emails(2))
+    dispatcher.flush()
+
+    assert len(server.messages) == 2
+    assert len(server.connections) == 2
+    assert server.connections[0].closed
+
+
+def test_emails_failing_every_attempt_are_dead_lettered():
+    server = FakeSMTPServer(fail_sends=3)
+    dispatcher = MailDispatcher(server.connect, max_retries=2, sleep=lambda _: None)
+    emails = create_emails(2)
+    dispatcher.enqueue_all(emails)
+    dispatcher.flush()
+
+    assert dispatcher.dead_letters == [emails[0]]
+    assert dispatcher.metrics.failed == 1
+    assert dispatcher.metrics.sent == 1
+    assert [message["To"] for message in server.messages] == [emails[1].recipient]
+
+
+def test_permanent_refusals_are_not_retried():
+    server = FakeSMTPServer(fail_sends=1, fail_code=550)
+    delays: list[float] = []
+    dispatcher = MailDispatcher(server.connect, sleep=delays.append)
+    emails = create_emails(2)
+    dispatcher.enqueue_all(emails)
+    dispatcher.flush()
+
+    assert dispatcher.dead_letters == [emails[0]]
+    assert delays == []
+    assert dispatcher.metrics.retries == 0
+    assert len(server.messages) == 1
+
+
+def test_waiting_flush_wakes_when_a_connection_is_dropped():
+    server = FakeSMTPServer(drop_connections=1)
+    sending = threading.Event()
+    release = threading.Event()
+
+    class GatedConnection(FakeSMTPConnection):
+        def send_message(self, msg: EmailMessage) -> dict:
+            sending.set()
+            release.wait(timeout=5)
+            return super().send_message(msg)
+
+    connects = 0
+
+    def connect() -> FakeSMTPConnection:
+        nonlocal connects
+        connects += 1
+        if connects == 1:
+            return GatedConnection(server)
+        if connects == 2:
+            raise OSError("Connection refused")
+        return server.connect()
+
+    dispatcher = MailDispatcher(connect, pool_size=1, max_retries=1, sleep=lambda _: None)
+    dispatcher.enqueue(create_emails(1)[0])
+    first = threading.Thread(target=dispatcher.flush, daemon=True)
+    first.start()
+    assert sending.wait(timeout=5)
+    # The second flush waits for the only connection, which then drops and is not replaced.
+    dispatcher.enqueue(create_emails(1, sender="support@example.com")[0])
+    second = threading.Thread(target=dispatcher.flush, daemon=True)
+    second.start()
+    release.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+
+    assert not first.is_alive() and not second.is_alive()
+    assert dispatcher.metrics.sent + dispatcher.metrics.failed == 2
+
+
+def test_latency_percentile():
+    dispatcher = MailDispatcher(FakeSMTPServer().connect)
+    assert dispatcher.metrics.latency_percentile(99) == 0.0
+    dispatcher.metrics.latencies.extend([0.1, 0.2, 0.3, 0.4])
+    assert dispatcher.metrics.latency_percentile(50) == 0.3
+    assert dispatcher.metrics.latency_percentile(100) == 0.4
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        MailDispatcher(FakeSMTPServer().connect, pool_size=0)
+    with pytest.raises(ValueError):
+        MailDispatcher(FakeSMTPServer().connect, batch_size=0)
@@ -0,0 +1,120 @@
+import pytest
+
+from design_challenge.day4.after_tomaluuk import Order, OrderStatus, OrderType
+from design_challenge.day4.bulk import process_orders
+from design_challenge.day4.mail import MailDispatcher
+from design_challenge.day4.outbox import DedupIndex, Outbox, fingerprint
+from design_challenge.day4.tests.test_mail import FakeSMTPServer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_orders(count: int) -> list[Order]:
+    return [
+        Order(i, OrderType.IN_STORE if i % 3 == 0 else OrderType.ONLINE, f"customer{i}@gmail.com")
+        for i in range(count)
+    ]
+
+
+def test_replayed_order_batch_is_sent_once():
+    server = FakeSMTPServer()
+    orders = create_orders(30)
+    with MailDispatcher(server.connect) as dispatcher:
+        outbox = Outbox(dispatcher)
+        for _ in range(5):
+            process_orders(orders, batch_size=7)
+            outbox.submit(orders)
+            dispatcher.flush()
+
+    assert len(server.messages) == 30
+    assert outbox.duplicates == 4 * 30
+    assert sorted(message["To"] for message in server.messages) == sorted(
+        order.customer_email for order in orders
+    )
+
+
+def test_dead_lettered_email_can_be_replayed():
+    server = FakeSMTPServer(fail_sends=1)
+    dispatcher = MailDispatcher(server.connect, max_retries=0)
+    outbox = Outbox(dispatcher)
+    order = Order(1, OrderType.ONLINE, "sarah@gmail.com", OrderStatus.CONFIRMED)
+
+    assert outbox.submit([order]) == 1
+    dispatcher.flush()
+    assert len(dispatcher.dead_letters) == 1
+    assert len(outbox.index) == 0
+
+    # The server recovered, so replaying the order delivers its email.
+    assert outbox.submit([order]) == 1
+    dispatcher.flush()
+    assert len(server.messages) == 1
+    assert outbox.submit([order]) == 0
+
+
+def test_queued_email_is_a_duplicate_until_delivered():
+    server = FakeSMTPServer()
+    dispatcher = MailDispatcher(server.connect)
+    outbox = Outbox(dispatcher)
+    order = Order(1, OrderType.ONLINE, "sarah@gmail.com", OrderStatus.CONFIRMED)
+    assert outbox.submit([order]) == 1
+    assert outbox.submit([order]) == 0
+    assert len(outbox.index) == 0
+    dispatcher.flush()
+    assert len(outbox.index) == 1
+    assert len(server.messages) == 1
+
+
+def test_status_change_is_not_a_duplicate():
+    dispatcher = MailDispatcher(FakeSMTPServer().connect)
+    outbox = Outbox(dispatcher)
+    order = Order(1, OrderType.ONLINE, "sarah@gmail.com", OrderStatus.CONFIRMED)
+    assert outbox.submit([order]) == 1
+    order.status = OrderStatus.SHIPPED
+    assert outbox.submit([order, order]) == 1
+    assert dispatcher.queue_depth == 2
+    assert outbox.duplicates == 1
+
+
+def test_orders_without_email_are_skipped():
+    outbox = Outbox(MailDispatcher(FakeSMTPServer().connect))
+    assert outbox.submit([Order(1, OrderType.ONLINE, "sarah@gmail.com")]) == 0
+    assert len(outbox.index) == 0
+
+
+def test_fingerprint():
+    order = Order(7, OrderType.ONLINE, "sarah@gmail.com", OrderStatus.CONFIRMED)
+    assert fingerprint(order) == ("sarah@gmail.com", "Order Confirmation", 7, OrderStatus.CONFIRMED)
+
+
+def test_index_entries_expire():
+    clock = FakeClock()
+    index = DedupIndex(ttl=10, clock=clock)
+    key = ("sarah@gmail.com", "Order Confirmation", 1, OrderStatus.CONFIRMED)
+    assert index.add(key)
+    clock.now = 9.9
+    assert not index.add(key)
+    clock.now = 10
+    assert index.add(key)
+    assert len(index) == 1
+
+
+def test_index_is_bounded():
+    index = DedupIndex(max_entries=3)
+    keys = [("sarah@gmail.com", "Order Shipped", i, OrderStatus.SHIPPED) for i in range(4)]
+    for key in keys:
+        assert index.add(key)
+    assert len(index) == 3
+    # The oldest entry was evicted to make room.
+    assert index.add(keys[0])
+    assert not index.add(keys[3])
+
+
+def test_invalid_max_entries():
+    with pytest.raises(ValueError):
+        DedupIndex(max_entries=0)
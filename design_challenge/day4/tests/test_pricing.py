@@ -0,0 +1,75 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from design_challenge.day4 import after_tomaluuk_2
+from design_challenge.day4.after_tomaluuk import Item, calculate_price
+from design_challenge.day4.pricing import PriceAggregate
+
+DISCOUNTS = [Decimal(0), Decimal("0.1"), Decimal("0.25"), Decimal("0.333"), Decimal(1)]
+
+
+def create_items(count: int, seed: int = 0) -> list[Item]:
+    rng = random.Random(seed)
+    return [Item(f"item{i}", Decimal(rng.randint(1, 100_000)).scaleb(-2)) for i in range(count)]
+
+
+def assert_matches(aggregate: PriceAggregate, items: list[Item]) -> None:
+    assert aggregate.total == after_tomaluuk_2.calculate_total_price(items)
+    for discount in DISCOUNTS:
+        assert aggregate.discounted(discount) == calculate_price(items, discount)
+        assert aggregate.discounted(discount) == after_tomaluuk_2.calculate_discounted_price(
+            items, discount
+        )
+
+
+def test_matches_existing_functions():
+    items = create_items(100)
+    aggregate = PriceAggregate(items)
+    assert len(aggregate) == 100
+    assert_matches(aggregate, items)
+
+
+def test_empty():
+    aggregate = PriceAggregate()
+    assert aggregate.total == 0
+    assert aggregate.discounted(Decimal("0.5")) == 0
+    assert len(aggregate) == 0
+
+
+def test_matches_after_random_adds_and_removes():
+    rng = random.Random(1)
+    pool = create_items(20, seed=2)
+    items: list[Item] = []
+    aggregate = PriceAggregate()
+    for _ in range(500):
+        if items and rng.random() < 0.4:
+            item = items.pop(rng.randrange(len(items)))
+            aggregate.remove(item)
+        else:
+            item = rng.choice(pool)
+            items.append(item)
+            aggregate.add(item)
+        assert_matches(aggregate, items)
+    assert len(aggregate) == len(items)
+
+
+def test_float_derived_price_does_not_drift():
+    small = Item("a", Decimal(0.1))
+    large = Item("b", Decimal("1000000"))
+    aggregate = PriceAggregate([small, large])
+    aggregate.remove(large)
+    assert aggregate.total == after_tomaluuk_2.calculate_total_price([small])
+    assert_matches(aggregate, [small])
+
+
+def test_remove_missing_item():
+    item = Item("T-Shirt", Decimal("19.99"))
+    aggregate = PriceAggregate([item])
+    with pytest.raises(ValueError):
+        aggregate.remove(Item("T-Shirt", Decimal("9.99")))
+    aggregate.remove(item)
+    with pytest.raises(ValueError):
+        aggregate.remove(item)
+    assert aggregate.total == 0
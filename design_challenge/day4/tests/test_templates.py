@@ -0,0 +1,64 @@
+from design_challenge.day4.after_tomaluuk import Order, OrderStatus, OrderType, generate_order_email
+from design_challenge.day4.after_tomaluuk_2 import (
+    generate_order_confirmation_email,
+    generate_order_shipping_notification,
+)
+from design_challenge.day4.templates import (
+    ORDER_CONFIRMATION,
+    ORDER_SHIPPED,
+    TEMPLATES,
+    EmailTemplate,
+    render_order_emails,
+)
+from dataclasses import asdict
+import pytest
+
+
+def create_orders(count: int) -> list[Order]:
+    return [Order(i, OrderType.ONLINE, f"customer{i}@gmail.com") for i in range(count)]
+
+
+def test_batch_matches_generate_functions():
+    orders = create_orders(20)
+    # The two day 4 modules define separate but identical Email dataclasses.
+    assert [asdict(email) for email in ORDER_CONFIRMATION.render_batch(orders)] == [
+        asdict(generate_order_confirmation_email(order)) for order in orders
+    ]
+    assert [asdict(email) for email in ORDER_SHIPPED.render_batch(orders)] == [
+        asdict(generate_order_shipping_notification(order)) for order in orders
+    ]
+
+
+def test_render_by_status_matches_generate_order_email():
+    orders = create_orders(10)
+    for order in orders:
+        order.status = OrderStatus.CONFIRMED if order.id % 2 else OrderStatus.SHIPPED
+    orders.append(Order(99, OrderType.IN_STORE, "john@gmail.com"))  # in progress, no email
+
+    batches = render_order_emails(orders)
+    rendered = [email for batch in batches.values() for email in batch]
+    expected = [generate_order_email(order) for order in orders if order.id != 99]
+    assert sorted(map(str, rendered)) == sorted(map(str, expected))
+
+
+def test_registry_is_keyed_by_subject_and_status():
+    assert TEMPLATES[("Order Shipped", OrderStatus.SHIPPED)] is ORDER_SHIPPED
+    email = ORDER_CONFIRMATION.render(Order(7, OrderType.ONLINE, "sarah@gmail.com"))
+    assert asdict(email)["body"] == "Thank you for your order! Your order #7 has been confirmed."
+
+
+def test_batch_indexing():
+    batch = ORDER_SHIPPED.render_batch(create_orders(3))
+    assert len(batch) == 3
+    assert batch[2].recipient == "customer2@gmail.com"
+
+
+@pytest.mark.parametrize("body", ["No field", "#{order_id} and {order_id}", "#{id}", "#{order_id:05}"])
+def test_invalid_templates(body):
+    with pytest.raises(ValueError):
+        EmailTemplate.compile("Subject", OrderStatus.CONFIRMED, body)
+
+
+def test_escaped_braces():
+    template = EmailTemplate.compile("Subject", OrderStatus.CONFIRMED, "{{#}}{order_id}{{!}}")
+    assert template.render(Order(5, OrderType.ONLINE, "a@b.c")).body == "{#}5{!}"
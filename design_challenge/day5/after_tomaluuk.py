@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from decimal import Decimal
 
+from design_challenge import money
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
     price: Decimal
@@ -17,7 +19,7 @@ def main():
         Item("Pizza", Decimal("11.90"), 5),
     ]
 
-    total = sum(item.price * item.quantity for item in items)
+    total = money.total_price(items)
 
     # Print the cart
     print("Shopping Cart:")
@@ -1,5 +1,16 @@
+import io
+import weakref
+from bisect import insort
+from collections.abc import Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import partial
+from itertools import count
+from typing import Callable, Iterable, Iterator, overload
+
+from design_challenge.money import RunningTotal
+from design_challenge.rendering import format_row, write_table
 
 
 class ItemNotFoundException(Exception):
@@ -23,11 +34,61 @@ class InvalidPriceException(Exception):
         super().__init__(self.message)
 
 
-@dataclass
-class Item:
+def _check_quantity(quantity: int) -> None:
+    if quantity <= 0:
+        raise InvalidQuantityException(quantity)
+
+
+def _check_price(price: Decimal) -> None:
+    if price <= Decimal(0):
+        raise InvalidPriceException(price)
+
+
+class TrackedLine:
+    """Validated price and quantity setters that tell the item stores holding a line.
+
+    Subclasses provide `name`, `price` and `quantity`, and an `_owners` tuple of
+    weak references to the stores; weak, so a line never keeps a dropped cart
+    alive. A tuple, so the many lines in no or one store share the empty tuple or
+    stay small.
+    """
+
+    __slots__ = ()
+
+    def set_quantity(self, quantity: int) -> None:
+        _check_quantity(quantity)
+        self._set(self.price, quantity)
+
+    def set_price(self, price: Decimal) -> None:
+        _check_price(price)
+        self._set(price, self.quantity)
+
+    def _set(self, price: Decimal, quantity: int) -> None:
+        old_price, old_quantity = self.price, self.quantity
+        self.price, self.quantity = price, quantity
+        for owner_ref in self._owners:
+            owner = owner_ref()
+            if owner is not None:
+                owner._line_changed(old_price, old_quantity, self)
+
+    def _attach(self, owner: "CartItems") -> None:
+        live = tuple(owner_ref for owner_ref in self._owners if owner_ref() is not None)
+        self._owners = live + (weakref.ref(owner),)
+
+    def _detach(self, owner: "CartItems") -> None:
+        # By identity: CartItems compare equal by their contents.
+        owners = self._owners
+        position = next(i for i, owner_ref in enumerate(owners) if owner_ref() is owner)
+        self._owners = owners[:position] + owners[position + 1 :]
+
+
+@dataclass(slots=True)
+class Item(TrackedLine):
     name: str
     price: Decimal
     quantity: int
+    # Weak references to the item stores holding this item; see `TrackedLine`.
+    _owners: tuple[weakref.ref, ...] = field(default=(), init=False, repr=False)
 
     def __eq__(self, other) -> bool:
         return (
@@ -40,57 +101,209 @@ class Item:
     def subtotal(self) -> Decimal:
         return self.price * self.quantity
 
-    def set_quantity(self, quantity: int) -> None:
-        if quantity <= 0:
-            raise InvalidQuantityException(quantity)
 
-        self.quantity = quantity
+class CartItems(Sequence[Item]):
+    """The items of a cart in display order, indexed by name.
+
+    A sequence like the list carts used to keep, so indexing, slicing, iterating
+    and comparing with a list work as before. Rows are kept in an insertion-ordered
+    dict keyed by row id, so finding and removing an item by name take O(1) and
+    removing a row leaves the order of the others intact. Several items may share
+    a name; lookups return the first one in display order, like a linear scan would.
+
+    Positional access goes through a list of the rows, rebuilt on first use after
+    a removal and kept up to date by appends, so an index loop over an unchanged
+    cart takes O(1) per item.
+
+    The total of the items is kept up to date as they are added, removed or
+    changed, so reading it is O(1). Items must be changed through `set_quantity`
+    and `set_price` (or the cart's `update_item`), and not renamed, while in the
+    cart; assigning `item.quantity` directly bypasses the total. An item shared by
+    several carts updates all of their totals.
+
+    Changes made inside `transaction()` are undone if the block raises.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self._rows: dict[int, Item] = {}
+        # The row ids of each name, in display order.
+        self._by_name: dict[str, list[int]] = {}
+        self._row_ids = count()
+        # The rows in display order for positional access, or None until next needed.
+        self._positions: list[Item] | None = []
+        self._total = RunningTotal()
+        # Undo steps for the changes made in the open transaction, if any.
+        self._journal: list[Callable[[], object]] | None = None
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._rows.values())
+
+    @overload
+    def __getitem__(self, index: int) -> Item:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Item]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Item | list[Item]:
+        positions = self._positions
+        if positions is None:
+            positions = self._positions = list(self._rows.values())
+        return positions[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CartItems, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CartItems({list(self)!r})"
 
-    def set_price(self, price: Decimal) -> None:
-        if price <= Decimal(0):
-            raise InvalidPriceException(price)
+    @property
+    def total(self) -> Decimal:
+        return self._total.value
+
+    def append(self, item: Item) -> None:
+        self._total.add(item.price, item.quantity)
+        row_id = next(self._row_ids)
+        self._rows[row_id] = item
+        self._by_name.setdefault(item.name, []).append(row_id)
+        if self._positions is not None:
+            self._positions.append(item)
+        item._attach(self)
+        if self._journal is not None:
+            self._journal.append(partial(self._remove_row, row_id))
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.append(item)
+
+    def find(self, name: str) -> Item | None:
+        row_ids = self._by_name.get(name)
+        return self._rows[row_ids[0]] if row_ids else None
+
+    def count_name(self, name: str) -> int:
+        """Number of items called `name`."""
+        return len(self._by_name.get(name, ()))
+
+    def remove(self, item: Item) -> None:
+        """Remove the first item equal to `item`, like `list.remove`."""
+        for row_id in self._by_name.get(item.name, ()):
+            if self._rows[row_id] == item:
+                self._remove_row(row_id)
+                return
+        raise ValueError(f"{item} is not in the cart.")
+
+    @contextmanager
+    def transaction(self) -> Iterator["CartItems"]:
+        """Undo every change made to the items in the `with` block if it raises.
+
+        Each change made meanwhile records how to undo it, so rolling back takes time
+        in proportion to the changes, not to the cart. Transactions may be nested.
+        """
+        outer = self._journal
+        journal = self._journal = [] if outer is None else outer
+        start = len(journal)
+        try:
+            yield self
+        except BaseException:
+            # Undoing must not record undo steps of its own.
+            self._journal = None
+            for undo in reversed(journal[start:]):
+                undo()
+            del journal[start:]
+            raise
+        finally:
+            self._journal = outer
+
+    def _remove_row(self, row_id: int) -> None:
+        item = self._rows.pop(row_id)
+        row_ids = self._by_name[item.name]
+        row_ids.remove(row_id)
+        if not row_ids:
+            del self._by_name[item.name]
+        self._positions = None
+        self._total.remove(item.price, item.quantity)
+        item._detach(self)
+        if self._journal is not None:
+            self._journal.append(partial(self._restore_row, row_id, item))
+
+    def _restore_row(self, row_id: int, item: Item) -> None:
+        """Put a removed row back in its original place. Takes O(n) unless it was last."""
+        last_row_id = next(reversed(self._rows), -1)
+        self._rows[row_id] = item
+        insort(self._by_name.setdefault(item.name, []), row_id)
+        if row_id < last_row_id:
+            # Row ids grow with every append, so sorting by them restores display order.
+            self._rows = dict(sorted(self._rows.items()))
+        self._positions = None
+        self._total.add(item.price, item.quantity)
+        item._attach(self)
+
+    def _line_changed(self, old_price: Decimal, old_quantity: int, item: Item) -> None:
+        self._total.remove(old_price, old_quantity)
+        self._total.add(item.price, item.quantity)
+        if self._journal is not None:
+            self._journal.append(partial(item._set, old_price, old_quantity))
+
+
+@dataclass(frozen=True)
+class AddItem:
+    item: Item
+
+
+@dataclass(frozen=True)
+class UpdateItem:
+    name: str
+    quantity: int | None = None
+    price: Decimal | None = None
 
-        self.price = price
+
+@dataclass(frozen=True)
+class RemoveItem:
+    name: str
+
+
+CartOperation = AddItem | UpdateItem | RemoveItem
 
 
 @dataclass
 class ShoppingCart:
-    items: list[Item] = field(default_factory=list)
+    items: CartItems = field(default_factory=CartItems)
     discount_code: str | None = None
 
+    def __post_init__(self) -> None:
+        if not isinstance(self.items, CartItems):
+            self.items = CartItems(self.items)
+
     def __len__(self):
         return len(self.items)
 
     def __str__(self) -> str:
         """Override string representation of the shopping cart."""
-
-        # Use string concatenation due to indentation issues.
-        output_str = (
-            "Shopping Cart:\n"
-            + f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}"
-            + f"{self._get_items_str}\n"
-            + f"{'=' * 40}\n"
-            f"Total: ${self.total:>7.2f}\n"
-        )
-        return output_str
+        output = io.StringIO()
+        write_table(self.items, output)
+        output.write(f"Total: ${self.total:>7.2f}\n")
+        return output.getvalue()
 
     @property
     def total(self):
-        return sum(item.subtotal for item in self.items)
+        return self.items.total
 
     @property
     def _get_items_str(self):
-        items_str = ""
-        for item in self.items:
-            items_str += f"""\n{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"""
-        return items_str
+        return "".join(f"\n{format_row(item)}" for item in self.items)
 
     def find_item(self, name: str) -> Item:
-        for item in self.items:
-            if item.name == name:
-                return item
-
-        raise ItemNotFoundException(name)
+        item = self.items.find(name)
+        if item is None:
+            raise ItemNotFoundException(name)
+        return item
 
     def update_item(
         self, name: str, quantity: int | None = None, price: Decimal | None = None
@@ -113,6 +326,56 @@ class ShoppingCart:
     def add_item(self, item: Item) -> None:
         self.items.append(item)
 
+    def apply(self, operations: Iterable[CartOperation]) -> None:
+        """Apply a batch of operations in order, either all of them or none.
+
+        Every quantity, price and item name is checked before anything changes,
+        raising the exception `update_item` or `remove_item` would. Should applying
+        still fail, the changes made so far are rolled back.
+        """
+        operations = list(operations)
+        self._validate(operations)
+
+        with self.items.transaction():
+            for operation in operations:
+                if type(operation) is UpdateItem:
+                    self.update_item(operation.name, operation.quantity, operation.price)
+                elif type(operation) is AddItem:
+                    self.add_item(operation.item)
+                else:
+                    self.remove_item(operation.name)
+
+    def _validate(self, operations: list[CartOperation]) -> None:
+        # How many items of a name the cart will hold, for names added or removed so far.
+        name_counts: dict[str, int] = {}
+        for operation in operations:
+            kind = type(operation)
+            if kind is AddItem:
+                item = operation.item
+                _check_quantity(item.quantity)
+                _check_price(item.price)
+                count = name_counts.get(item.name)
+                if count is None:
+                    count = self.items.count_name(item.name)
+                name_counts[item.name] = count + 1
+                continue
+            if kind is not UpdateItem and kind is not RemoveItem:
+                raise TypeError(f"Not a cart operation: {operation!r}")
+
+            name = operation.name
+            count = name_counts.get(name)
+            if count is None:
+                count = self.items.count_name(name)
+            if not count:
+                raise ItemNotFoundException(name)
+            if kind is UpdateItem:
+                if operation.quantity is not None:
+                    _check_quantity(operation.quantity)
+                if operation.price is not None:
+                    _check_price(operation.price)
+            else:
+                name_counts[name] = count - 1
+
 
 def main() -> None:
     # Create a shopping cart and add some items to it
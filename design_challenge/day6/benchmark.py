@@ -0,0 +1,117 @@
+"""Benchmark editing ever larger carts and reading their totals, against how carts used to do it."""
+import random
+import time
+from decimal import Decimal
+
+from design_challenge.day6.after_tomaluuk import (
+    Item,
+    ItemNotFoundException,
+    ShoppingCart,
+    UpdateItem,
+)
+from design_challenge.money import total_price
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+EDITS = 1_000
+TOTAL_READS = 100
+SYNC_LINES = 10_000
+
+
+class ListShoppingCart(ShoppingCart):
+    """The cart as it was: items in a plain list, found by scanning it and summed on every read."""
+
+    def __post_init__(self) -> None:
+        self.items = list(self.items)
+
+    @property
+    def total(self):
+        return total_price(self.items)
+
+    def find_item(self, name: str) -> Item:
+        for item in self.items:
+            if item.name == name:
+                return item
+
+        raise ItemNotFoundException(name)
+
+
+def create_items(count: int) -> list[Item]:
+    return [Item(f"item-{i}", Decimal(i % 1000 + 1) / 100, i % 10 + 1) for i in range(count)]
+
+
+def time_edits(cart: ShoppingCart, names: list[str]) -> float:
+    """Seconds per edit, where each edit updates a line, then removes it and adds it back."""
+    start = time.perf_counter()
+    for name in names:
+        cart.update_item(name, quantity=3)
+        item = cart.find_item(name)
+        cart.remove_item(name)
+        cart.add_item(item)
+    return (time.perf_counter() - start) / len(names)
+
+
+def benchmark_edits() -> None:
+    rng = random.Random(0)
+    print(f"{'Items':>8}{'list scan':>14}{'indexed':>14}{'speedup':>10}")
+    for size in SIZES:
+        names = [f"item-{rng.randrange(size)}" for _ in range(EDITS)]
+        list_time = time_edits(ListShoppingCart(create_items(size)), names)
+        indexed_time = time_edits(ShoppingCart(create_items(size)), names)
+        print(
+            f"{size:>8}{list_time * 1e6:>12.1f}us{indexed_time * 1e6:>12.1f}us"
+            f"{list_time / indexed_time:>9.1f}x"
+        )
+
+
+def time_edit_and_total(cart: ShoppingCart, names: list[str]) -> float:
+    """Seconds per quantity change followed by reading the cart total."""
+    start = time.perf_counter()
+    for quantity, name in enumerate(names, start=1):
+        cart.find_item(name).set_quantity(quantity)
+        cart.total
+    return (time.perf_counter() - start) / len(names)
+
+
+def benchmark_totals() -> None:
+    rng = random.Random(0)
+    print(f"\n{'Items':>8}{'fresh sum':>14}{'running':>14}{'speedup':>10}")
+    for size in SIZES:
+        # Quantity changes on the first lines, so the list scan does not dominate.
+        names = [f"item-{rng.randrange(min(size, 10))}" for _ in range(TOTAL_READS)]
+        fresh_time = time_edit_and_total(ListShoppingCart(create_items(size)), names)
+        running_time = time_edit_and_total(ShoppingCart(create_items(size)), names)
+        print(
+            f"{size:>8}{fresh_time * 1e6:>12.1f}us{running_time * 1e6:>12.1f}us"
+            f"{fresh_time / running_time:>9.1f}x"
+        )
+
+
+def benchmark_sync() -> None:
+    updates = [
+        UpdateItem(f"item-{i}", quantity=i % 7 + 1, price=Decimal(i % 500 + 1) / 100)
+        for i in range(SYNC_LINES)
+    ]
+    print(f"\nSyncing {SYNC_LINES} lines:")
+
+    cart = ShoppingCart(create_items(SYNC_LINES))
+    start = time.perf_counter()
+    for update in updates:
+        cart.update_item(update.name, update.quantity, update.price)
+    looped = time.perf_counter() - start
+    print(f"{'update_item per line':<24}{looped * 1000:>8.2f} ms")
+
+    cart = ShoppingCart(create_items(SYNC_LINES))
+    start = time.perf_counter()
+    cart.apply(updates)
+    applied = time.perf_counter() - start
+    print(f"{'apply':<24}{applied * 1000:>8.2f} ms ({looped / applied:.1f}x)")
+
+
+def main() -> None:
+    benchmark_edits()
+    benchmark_totals()
+    benchmark_sync()
+
+
+if __name__ == "__main__":
+    main()
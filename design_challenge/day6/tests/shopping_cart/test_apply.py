@@ -0,0 +1,112 @@
+from design_challenge.day6.after_tomaluuk import (
+    AddItem,
+    RemoveItem,
+    ShoppingCart,
+    UpdateItem,
+    Item,
+    InvalidPriceException,
+    InvalidQuantityException,
+    ItemNotFoundException,
+)
+from design_challenge.money import total_price
+from decimal import Decimal
+import pytest
+
+
+class UncountableQuantity:
+    """A quantity that passes validation but cannot be totalled, to make applying fail."""
+
+    def __le__(self, other) -> bool:
+        return False
+
+
+def create_cart() -> ShoppingCart:
+    return ShoppingCart(
+        [
+            Item("Apple", Decimal("1.50"), 10),
+            Item("Banana", Decimal("2.00"), 2),
+            Item("Pizza", Decimal("11.90"), 5),
+        ]
+    )
+
+
+def snapshot(cart: ShoppingCart) -> list[tuple[str, Decimal, int]]:
+    return [(item.name, item.price, item.quantity) for item in cart.items]
+
+
+def test_apply_matches_single_edits():
+    operations = [
+        UpdateItem("Apple", quantity=3),
+        RemoveItem("Banana"),
+        AddItem(Item("Burger", Decimal("7.90"), 2)),
+        UpdateItem("Burger", price=Decimal("6.90")),
+        UpdateItem("Pizza", quantity=1, price=Decimal("3.50")),
+    ]
+    cart = create_cart()
+    cart.apply(operations)
+
+    expected = create_cart()
+    expected.update_item("Apple", quantity=3)
+    expected.remove_item("Banana")
+    expected.add_item(Item("Burger", Decimal("7.90"), 2))
+    expected.update_item("Burger", price=Decimal("6.90"))
+    expected.update_item("Pizza", quantity=1, price=Decimal("3.50"))
+
+    assert snapshot(cart) == snapshot(expected)
+    assert cart.total == expected.total == total_price(cart.items)
+
+
+@pytest.mark.parametrize(
+    "operation, exception",
+    [
+        (UpdateItem("Apple", quantity=0), InvalidQuantityException),
+        (UpdateItem("Apple", price=Decimal("-1")), InvalidPriceException),
+        (AddItem(Item("Burger", Decimal("7.90"), -2)), InvalidQuantityException),
+        (AddItem(Item("Burger", Decimal(0), 2)), InvalidPriceException),
+        (RemoveItem("Burger"), ItemNotFoundException),
+        (UpdateItem("Banana", quantity=1), ItemNotFoundException),
+    ],
+)
+def test_invalid_batch_changes_nothing(operation, exception):
+    cart = create_cart()
+    before = snapshot(cart)
+    with pytest.raises(exception):
+        cart.apply([UpdateItem("Apple", quantity=3), RemoveItem("Banana"), operation])
+    assert snapshot(cart) == before
+    assert cart.total == total_price(cart.items)
+
+
+def test_names_added_and_removed_in_the_batch_are_tracked():
+    cart = create_cart()
+    cart.apply([AddItem(Item("Burger", Decimal("7.90"), 2)), RemoveItem("Burger")])
+    assert snapshot(cart) == snapshot(create_cart())
+    with pytest.raises(ItemNotFoundException):
+        cart.apply([RemoveItem("Apple"), RemoveItem("Apple")])
+
+
+def test_failure_while_applying_rolls_back():
+    cart = create_cart()
+    before = snapshot(cart)
+    total = cart.total
+    with pytest.raises(TypeError):
+        cart.apply(
+            [
+                UpdateItem("Pizza", quantity=1),
+                RemoveItem("Apple"),
+                AddItem(Item("Burger", Decimal("7.90"), 2)),
+                RemoveItem("Burger"),
+                RemoveItem("Banana"),
+                AddItem(Item("Cake", Decimal("5.00"), UncountableQuantity())),
+            ]
+        )
+    assert snapshot(cart) == before
+    assert cart.total == total
+    # The restored rows are still indexed by name.
+    cart.remove_item("Apple")
+    assert [item.name for item in cart.items] == ["Banana", "Pizza"]
+
+
+def test_not_an_operation():
+    cart = create_cart()
+    with pytest.raises(TypeError):
+        cart.apply([cart.items[0]])
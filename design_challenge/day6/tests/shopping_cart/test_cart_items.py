@@ -0,0 +1,122 @@
+from design_challenge.day6.after_tomaluuk import (
+    CartItems,
+    ShoppingCart,
+    Item,
+    ItemNotFoundException,
+)
+from decimal import Decimal
+import random
+import pytest
+
+
+def create_items(count: int) -> list[Item]:
+    return [Item(f"Item {i}", Decimal(i + 1), i % 5 + 1) for i in range(count)]
+
+
+def test_cart_accepts_a_list():
+    items = create_items(3)
+    cart = ShoppingCart(items)
+    assert isinstance(cart.items, CartItems)
+    assert cart.items == items
+    assert len(cart) == 3
+    assert cart.items[-1] is items[-1]
+
+
+def test_items_behave_like_a_list():
+    items = create_items(5)
+    cart = ShoppingCart(items)
+    assert [cart.items[i] for i in range(len(cart.items))] == items
+    assert cart.items[1:3] == items[1:3]
+    assert cart.items[::-1] == items[::-1]
+    assert cart.items.index(items[2]) == 2
+    assert items[4] in cart.items
+    assert list(reversed(cart.items)) == items[::-1]
+
+    extra = Item("Extra", Decimal(1), 1)
+    cart.items.append(extra)
+    assert cart.items == items + [extra]
+    assert cart.items != items
+    assert cart.items == CartItems(items + [extra])
+    with pytest.raises(IndexError):
+        cart.items[6]
+
+    # Positions follow removals and appends.
+    cart.remove_item("Item 1")
+    assert cart.items[1] is items[2]
+    cart.add_item(Item("Last", Decimal(1), 1))
+    assert cart.items[-1].name == "Last"
+    assert cart.items[:2] == [items[0], items[2]]
+
+
+def test_find_and_remove_keep_display_order():
+    items = create_items(100)
+    cart = ShoppingCart(items)
+    expected = list(items)
+    for name in random.Random(0).sample([item.name for item in items], 60):
+        assert cart.find_item(name).name == name
+        cart.remove_item(name)
+        expected = [item for item in expected if item.name != name]
+        assert list(cart.items) == expected
+
+    cart.add_item(Item("New", Decimal(1), 1))
+    assert list(cart.items)[-1].name == "New"
+    assert cart.find_item("New") == Item("New", Decimal(1), 1)
+
+
+def test_removed_item_is_not_found():
+    cart = ShoppingCart(create_items(2))
+    cart.remove_item("Item 0")
+    with pytest.raises(ItemNotFoundException):
+        cart.find_item("Item 0")
+    with pytest.raises(ItemNotFoundException):
+        cart.remove_item("Item 0")
+
+
+def test_duplicate_names_behave_like_a_list():
+    first = Item("Book", Decimal(10), 1)
+    second = Item("Book", Decimal(12), 2)
+    cart = ShoppingCart([first, Item("Pen", Decimal(1), 1), second])
+    assert cart.find_item("Book") is first
+    cart.remove_item("Book")
+    assert cart.find_item("Book") is second
+    assert [item.name for item in cart.items] == ["Pen", "Book"]
+
+
+def test_remove_missing_item_from_storage():
+    items = CartItems(create_items(1))
+    with pytest.raises(ValueError):
+        items.remove(Item("Item 0", Decimal(99), 1))
+
+
+def test_transaction_rolls_back_on_error():
+    items = create_items(5)
+    cart_items = CartItems(items)
+    other = CartItems(items[:2])
+    before, total, other_total = list(cart_items), cart_items.total, other.total
+    with pytest.raises(RuntimeError), cart_items.transaction():
+        cart_items.remove(items[1])
+        items[0].set_quantity(9)
+        cart_items.append(Item("New", Decimal(3), 1))
+        with pytest.raises(KeyError), cart_items.transaction():
+            cart_items.remove(items[3])
+            raise KeyError("nested")
+        assert len(cart_items) == 5
+        cart_items.remove(items[4])
+        raise RuntimeError("failed")
+
+    assert cart_items == before
+    assert items[0].quantity == 1
+    assert cart_items.total == total
+    assert other.total == other_total
+    assert cart_items.find("Item 1") is items[1]
+    assert cart_items.count_name("New") == 0
+
+
+def test_transaction_keeps_changes_without_error():
+    cart_items = CartItems(create_items(3))
+    with cart_items.transaction():
+        cart_items.append(Item("New", Decimal(3), 1))
+    assert cart_items.count_name("New") == 1
+    with pytest.raises(RuntimeError), cart_items.transaction():
+        raise RuntimeError("failed")
+    assert cart_items.count_name("New") == 1
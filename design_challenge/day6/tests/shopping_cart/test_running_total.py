@@ -0,0 +1,98 @@
+from design_challenge.day6.after_tomaluuk import (
+    ShoppingCart,
+    Item,
+    InvalidQuantityException,
+)
+from design_challenge.money import Money, total_price
+from decimal import Decimal
+import gc
+import random
+import weakref
+import pytest
+
+NAMES = ["Apple", "Banana", "Pizza", "Burger", "Book"]
+
+
+def random_price(rng: random.Random) -> Decimal | Money:
+    cents = rng.randrange(1, 10_000)
+    return Money(cents) if rng.random() < 0.3 else Decimal(cents).scaleb(-2)
+
+
+def random_edit(cart: ShoppingCart, rng: random.Random) -> None:
+    edit = rng.randrange(5)
+    if edit == 0 or not len(cart):
+        cart.add_item(Item(rng.choice(NAMES), random_price(rng), rng.randint(1, 20)))
+    elif edit == 1:
+        cart.remove_item(rng.choice(list(cart.items)).name)
+    elif edit == 2:
+        cart.update_item(rng.choice(list(cart.items)).name, quantity=rng.randint(1, 20))
+    elif edit == 3:
+        cart.update_item(rng.choice(list(cart.items)).name, price=random_price(rng))
+    else:
+        item = rng.choice(list(cart.items))
+        item.set_quantity(rng.randint(1, 20))
+        item.set_price(random_price(rng))
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_running_total_matches_fresh_sum(seed: int):
+    rng = random.Random(seed)
+    cart = ShoppingCart([Item(name, random_price(rng), 1) for name in rng.sample(NAMES, 3)])
+    for _ in range(200):
+        random_edit(cart, rng)
+        assert cart.total == total_price(cart.items)
+        assert type(cart.total) is type(total_price(cart.items))
+
+
+def test_item_in_two_carts_updates_both():
+    item = Item("Apple", Decimal("1.50"), 2)
+    first, second = ShoppingCart([item]), ShoppingCart([item])
+    item.set_quantity(4)
+    assert first.total == second.total == Decimal("6.00")
+
+    first.remove_item("Apple")
+    item.set_price(Decimal("2.00"))
+    assert first.total == 0
+    assert second.total == Decimal("8.00")
+
+
+def test_failed_update_leaves_total_unchanged():
+    cart = ShoppingCart([Item("Apple", Decimal("1.50"), 2)])
+    with pytest.raises(InvalidQuantityException):
+        cart.update_item("Apple", quantity=0)
+    assert cart.total == Decimal("3.00")
+
+
+def test_float_derived_prices_do_not_drift():
+    rng = random.Random(1)
+    cart = ShoppingCart([Item("Book", Decimal(14.5), 2), Item("Pen", Decimal(0.1), 3)])
+    for _ in range(1000):
+        cart.update_item("Book", price=Decimal(rng.randrange(1, 1000) / 100))
+        assert cart.total == total_price(cart.items)
+
+    cart.remove_item("Book")
+    cart.remove_item("Pen")
+    assert cart.total == 0
+    assert not cart.total.is_signed()
+
+
+def test_money_only_total_skips_decimal_conversion():
+    cart = ShoppingCart([Item("Apple", Money(150), 2)])
+    assert type(cart.total) is Money and cart.total == Money(300)
+    cart.add_item(Item("Banana", Decimal("0.50"), 1))
+    assert cart.total == total_price(cart.items) == Money(350)
+    cart.remove_item("Banana")
+    assert type(cart.total) is Money and cart.total == Money(300)
+
+
+def test_items_do_not_keep_dropped_carts_alive():
+    item = Item("Apple", Decimal("1.50"), 2)
+    kept = ShoppingCart([item])
+    dropped = ShoppingCart([item])
+    dropped_ref = weakref.ref(dropped)
+    del dropped
+    gc.collect()
+    assert dropped_ref() is None
+
+    item.set_quantity(3)
+    assert kept.total == Decimal("4.50")
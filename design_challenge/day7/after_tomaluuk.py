@@ -1,14 +1,18 @@
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import ClassVar, Optional
+from typing import ClassVar, Optional, TextIO
 from decimal import Decimal
 
+from design_challenge.money import total_price
+from design_challenge.rendering import write_table
+
 
 class ItemNotFoundException(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     name: str
     price: Decimal
@@ -64,24 +68,21 @@ class ShoppingCart:
 
     @property
     def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+        return total_price(self.items)
 
     @property
     def total(self) -> Decimal:
         return self.subtotal - self.discount
 
-    def display(self) -> None:
-        # Print the cart
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
-            )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+    def display(self, file: TextIO | None = None) -> None:
+        # Print the cart, writing rows in chunks rather than one print per line
+        out = sys.stdout if file is None else file
+        write_table(self.items, out)
+        out.write(
+            f"Subtotal: ${self.subtotal:>7.2f}\n"
+            f"Discount: ${self.discount:>7.2f}\n"
+            f"Total:    ${self.total:>7.2f}\n"
+        )
 
 
 def main() -> None:
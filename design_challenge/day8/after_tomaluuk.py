@@ -1,10 +1,14 @@
+import sys
 from dataclasses import dataclass, field
 from decimal import Decimal
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, TextIO
 
+from design_challenge.money import total_price
+from design_challenge.rendering import write_table
 
-@dataclass
+
+@dataclass(slots=True)
 class Item:
     name: str
     price: Decimal
@@ -91,7 +95,7 @@ class ShoppingCart:
 
     @property
     def subtotal(self) -> Decimal:
-        return Decimal(sum(item.subtotal for item in self.items))
+        return total_price(self.items)
 
     @property
     def total(self) -> Decimal:
@@ -116,17 +120,14 @@ class ShoppingCart:
                 )
         return total_discount
 
-    def display(self) -> None:
-        print("Shopping Cart:")
-        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
-        for item in self.items:
-            print(
-                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
-            )
-        print("=" * 40)
-        print(f"Subtotal: ${self.subtotal:>7.2f}")
-        print(f"Discount: ${self.discount:>7.2f}")
-        print(f"Total:    ${self.total:>7.2f}")
+    def display(self, file: TextIO | None = None) -> None:
+        out = sys.stdout if file is None else file
+        write_table(self.items, out)
+        out.write(
+            f"Subtotal: ${self.subtotal:>7.2f}\n"
+            f"Discount: ${self.discount:>7.2f}\n"
+            f"Total:    ${self.total:>7.2f}\n"
+        )
 
     def set_payment_method(self, payment_method: str) -> None:
         if payment_method in PAYMENT_METHODS:
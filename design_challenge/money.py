@@ -0,0 +1,220 @@
+"""A fixed-point money type counting integer cents, for fast exact balance arithmetic."""
+from decimal import (
+    MAX_EMAX,
+    MAX_PREC,
+    MIN_EMIN,
+    ROUND_HALF_EVEN,
+    Context,
+    Decimal,
+    localcontext,
+)
+from typing import Iterable, Protocol
+
+# The rounding Decimal's default context uses, so rounded results match quantized Decimals.
+DEFAULT_ROUNDING = ROUND_HALF_EVEN
+# Sums of Decimal prices are taken in this context, so they are exact however many digits
+# the prices have, and a running total never drifts from a fresh sum.
+EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+class InexactMoneyException(Exception):
+    def __init__(self, value, message="Amount is not a whole number of cents."):
+        self.value = value
+        self.message = f"{message} Amount given: {self.value}"
+        super().__init__(self.message)
+
+
+class Money:
+    """An amount of money stored as a whole number of cents.
+
+    Adding, subtracting and multiplying by whole quantities are exact integer
+    operations. Decimals are converted exactly, or raise `InexactMoneyException`
+    unless a rounding mode is passed explicitly. Multiplying by a Decimal rate
+    rounds to the cent with `DEFAULT_ROUNDING`.
+    """
+
+    # A plain slotted class rather than a dataclass: arithmetic creates many of these.
+    __slots__ = ("cents",)
+
+    def __init__(self, cents: int) -> None:
+        self.cents = cents
+
+    @classmethod
+    def from_decimal(cls, value: Decimal | int | str, rounding: str | None = None) -> "Money":
+        value = Decimal(value)
+        cents = value.scaleb(2)
+        if cents != cents.to_integral_value():
+            if rounding is None:
+                raise InexactMoneyException(value)
+            cents = cents.to_integral_value(rounding=rounding)
+        return cls(int(cents))
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.to_decimal(), format_spec)
+
+    def __hash__(self) -> int:
+        # Equal Money, Decimal and int values must hash alike.
+        return hash(self.to_decimal())
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, (Decimal, int)):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other: "Money | Decimal | int") -> bool:
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        if isinstance(other, (Decimal, int)):
+            return self.to_decimal() < other
+        return NotImplemented
+
+    def __le__(self, other: "Money | Decimal | int") -> bool:
+        if isinstance(other, Money):
+            return self.cents <= other.cents
+        if isinstance(other, (Decimal, int)):
+            return self.to_decimal() <= other
+        return NotImplemented
+
+    def __gt__(self, other: "Money | Decimal | int") -> bool:
+        if isinstance(other, Money):
+            return self.cents > other.cents
+        if isinstance(other, (Decimal, int)):
+            return self.to_decimal() > other
+        return NotImplemented
+
+    def __ge__(self, other: "Money | Decimal | int") -> bool:
+        if isinstance(other, Money):
+            return self.cents >= other.cents
+        if isinstance(other, (Decimal, int)):
+            return self.to_decimal() >= other
+        return NotImplemented
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.cents))
+
+    def __add__(self, other: "Money | Decimal | int") -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        return Money(self.cents + _cents(other))
+
+    # Lets sum() start from 0 and Decimals be added on the left.
+    __radd__ = __add__
+
+    def __sub__(self, other: "Money | Decimal | int") -> "Money":
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return Money(self.cents - _cents(other))
+
+    def __rsub__(self, other: "Decimal | int") -> "Money":
+        return Money(_cents(other) - self.cents)
+
+    def __mul__(self, factor: int | Decimal) -> "Money":
+        if isinstance(factor, int):
+            return Money(self.cents * factor)
+        if isinstance(factor, Decimal):
+            return Money.from_decimal(self.to_decimal() * factor, DEFAULT_ROUNDING)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+
+def _cents(value: Money | Decimal | int) -> int:
+    if isinstance(value, Money):
+        return value.cents
+    if isinstance(value, (Decimal, int)):
+        return Money.from_decimal(value).cents
+    raise TypeError(f"Cannot combine Money with {type(value).__name__}")
+
+
+class PricedItem(Protocol):
+    price: Decimal | Money
+    quantity: int
+
+
+def total_price(items: Iterable[PricedItem]) -> Decimal | Money:
+    """Sum of price times quantity over `items`.
+
+    Money prices are summed as plain integer cents, without creating an
+    intermediate Money per item. A cart of Decimal prices gives a Decimal, as before.
+    Item stores that can sum themselves, like `ColumnarItems`, provide `total_price()`.
+    """
+    store_total = getattr(items, "total_price", None)
+    if store_total is not None:
+        return store_total()
+    cents = 0
+    has_money = False
+    decimal_total = Decimal(0)
+    with localcontext(EXACT_CONTEXT):
+        for item in items:
+            price = item.price
+            if type(price) is Money:
+                cents += price.cents * item.quantity
+                has_money = True
+            else:
+                decimal_total += price * item.quantity
+
+    if not has_money:
+        return decimal_total
+    return Money(cents) + decimal_total
+
+
+class RunningTotal:
+    """The `total_price` of a changing set of lines, kept up to date line by line.
+
+    Money and Decimal subtotals are kept apart, as `total_price` sums them, so
+    `value` has the type and value a fresh `total_price` would give.
+    """
+
+    __slots__ = ("_cents", "_decimal", "_money_lines", "_decimal_lines")
+
+    def __init__(self) -> None:
+        self._cents = 0
+        self._decimal = Decimal(0)
+        self._money_lines = 0
+        self._decimal_lines = 0
+
+    @property
+    def value(self) -> Decimal | Money:
+        if not self._money_lines:
+            return self._decimal
+        if not self._decimal_lines:
+            # Adding even a zero Decimal converts it to cents, which is slow on every read.
+            return Money(self._cents)
+        return Money(self._cents) + self._decimal
+
+    def add(self, price: Decimal | Money, quantity: int) -> None:
+        if type(price) is Money:
+            self._cents += price.cents * quantity
+            self._money_lines += 1
+        else:
+            self._decimal = EXACT_CONTEXT.add(
+                self._decimal, EXACT_CONTEXT.multiply(price, quantity)
+            )
+            self._decimal_lines += 1
+
+    def remove(self, price: Decimal | Money, quantity: int) -> None:
+        if type(price) is Money:
+            self._cents -= price.cents * quantity
+            self._money_lines -= 1
+        else:
+            self._decimal = EXACT_CONTEXT.subtract(
+                self._decimal, EXACT_CONTEXT.multiply(price, quantity)
+            )
+            self._decimal_lines -= 1
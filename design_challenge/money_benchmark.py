@@ -0,0 +1,44 @@
+"""Benchmark summing cart lines with Decimal prices versus integer-cent Money prices."""
+import random
+import time
+from decimal import Decimal
+
+from design_challenge.day6.after_tomaluuk import Item
+from design_challenge.money import Money, total_price
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+# Repeat small carts so every size sums about the same number of lines.
+LINES_PER_SIZE = 10**6
+
+
+def time_total(items: list[Item], repeat: int) -> float:
+    # Plain lists: carts keep a running total, so reading theirs would sum nothing.
+    start = time.perf_counter()
+    for _ in range(repeat):
+        total_price(items)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'Items':>8}{'Decimal':>14}{'Money':>14}{'speedup':>10}")
+    for size in SIZES:
+        lines = [
+            (f"item-{i}", Decimal(rng.randrange(1, 10**5)) / 100, rng.randint(1, 10))
+            for i in range(size)
+        ]
+        decimal_items = [Item(*line) for line in lines]
+        money_items = [Item(name, Money.from_decimal(price), qty) for name, price, qty in lines]
+        assert total_price(money_items).to_decimal() == total_price(decimal_items)
+
+        repeat = LINES_PER_SIZE // size
+        decimal_time = time_total(decimal_items, repeat)
+        money_time = time_total(money_items, repeat)
+        print(
+            f"{size:>8}{decimal_time * 1e6:>12.1f}us{money_time * 1e6:>12.1f}us"
+            f"{decimal_time / money_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
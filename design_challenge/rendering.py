@@ -0,0 +1,102 @@
+"""Render carts as text tables, writing rows to any file-like sink in chunks."""
+from decimal import Decimal
+from typing import Iterable, Protocol, TextIO
+
+from design_challenge.money import Money
+
+TITLE = "Shopping Cart:"
+HEADER = f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}"
+SEPARATOR = "=" * 40
+# Rows joined into a single write, bounding the buffer for very large carts.
+ROWS_PER_WRITE = 4096
+
+
+class CartLine(Protocol):
+    name: str
+    price: Decimal | Money
+    quantity: int
+
+    @property
+    def subtotal(self) -> Decimal | Money:
+        ...
+
+
+def format_row(item: CartLine) -> str:
+    return f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+
+
+def write_lines(lines: Iterable[str], sink: TextIO, lines_per_write: int = ROWS_PER_WRITE) -> None:
+    """Write `lines`, each followed by a newline, joining up to `lines_per_write` per write."""
+    buffer: list[str] = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= lines_per_write:
+            buffer.append("")
+            sink.write("\n".join(buffer))
+            buffer.clear()
+    if buffer:
+        buffer.append("")
+        sink.write("\n".join(buffer))
+
+
+def write_table(items: Iterable[CartLine], sink: TextIO) -> None:
+    """Write the title, column header, a row per item and the closing separator line."""
+    sink.write(f"{TITLE}\n{HEADER}\n")
+    write_lines(map(format_row, items), sink)
+    sink.write(f"{SEPARATOR}\n")
+
+
+class CartRenderer:
+    """Renders the rows of a cart, reformatting only the rows that changed since last time.
+
+    Rows are cached per item object along with the values they were formatted
+    from, so redrawing a large cart after a few edits formats just those items.
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        # id(item) -> (item, name, price, quantity, row); holding the item keeps its id unique.
+        self._rows: dict[int, tuple[CartLine, str, Decimal | Money, int, str]] = {}
+
+    def update(self, items: Iterable[CartLine]) -> list[tuple[int, str]]:
+        """Re-render the rows of `items`, returning (position, row) for every row that changed.
+
+        Rows beyond the new `len(self.lines)` were removed and are not reported.
+        """
+        old_lines = self.lines
+        old_rows = self._rows
+        lines: list[str] = []
+        rows: dict[int, tuple[CartLine, str, Decimal | Money, int, str]] = {}
+        changed: list[tuple[int, str]] = []
+
+        old_count = len(old_lines)
+        for position, item in enumerate(items):
+            key = id(item)
+            cached = old_rows.get(key)
+            # Prices and quantities are replaced rather than mutated, so an unchanged
+            # row still holds the very same objects; anything else is just reformatted.
+            if (
+                cached is not None
+                and cached[1] is item.name
+                and cached[2] is item.price
+                and cached[3] is item.quantity
+            ):
+                row = cached[4]
+                rows[key] = cached
+            else:
+                row = format_row(item)
+                rows[key] = (item, item.name, item.price, item.quantity, row)
+            lines.append(row)
+            if position >= old_count or old_lines[position] != row:
+                changed.append((position, row))
+
+        self.lines = lines
+        self._rows = rows
+        return changed
+
+    def write(self, items: Iterable[CartLine], sink: TextIO) -> None:
+        """Write the whole table for `items`, reusing the cached rows of unchanged items."""
+        self.update(items)
+        sink.write(f"{TITLE}\n{HEADER}\n")
+        write_lines(self.lines, sink)
+        sink.write(f"{SEPARATOR}\n")
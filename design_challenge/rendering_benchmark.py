@@ -0,0 +1,70 @@
+"""Benchmark rendering a large cart: concatenation and print-per-line versus chunked writes."""
+import contextlib
+import io
+import os
+import random
+import time
+from decimal import Decimal
+
+from design_challenge.day6.after_tomaluuk import Item
+from design_challenge.rendering import CartRenderer, write_table
+
+LINES = 10**5
+EDITS = 10
+
+
+def concatenated_rows(items: list[Item]) -> str:
+    """The rows as `ShoppingCart._get_items_str` used to build them."""
+    items_str = ""
+    for item in items:
+        items_str += f"""\n{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"""
+    return items_str
+
+
+def print_rows(items: list[Item]) -> None:
+    """The rows as `display()` used to print them."""
+    print("Shopping Cart:")
+    print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
+    for item in items:
+        print(f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}")
+    print("=" * 40)
+
+
+def timed(label: str, render) -> None:
+    start = time.perf_counter()
+    render()
+    print(f"{label:<38}{(time.perf_counter() - start) * 1000:>9.1f} ms")
+
+
+def main() -> None:
+    rng = random.Random(0)
+    items = [
+        Item(f"item-{i}", Decimal(rng.randrange(1, 10**5)) / 100, rng.randint(1, 10))
+        for i in range(LINES)
+    ]
+    print(f"Rendering a {LINES}-line cart:")
+    timed("string concatenation", lambda: concatenated_rows(items))
+    timed("print per line, to StringIO", lambda: _redirected(items, io.StringIO()))
+    timed("write_table, to StringIO", lambda: write_table(items, io.StringIO()))
+
+    with open(os.devnull, "w") as devnull:
+        timed("print per line, to a file", lambda: _redirected(items, devnull))
+        timed("write_table, to a file", lambda: write_table(items, devnull))
+
+        renderer = CartRenderer()
+        timed("CartRenderer, first draw", lambda: renderer.write(items, devnull))
+        for item in rng.sample(items, EDITS):
+            item.set_quantity(item.quantity + 1)
+        timed(f"CartRenderer, redraw after {EDITS} edits", lambda: renderer.write(items, devnull))
+        for item in rng.sample(items, EDITS):
+            item.set_quantity(item.quantity + 1)
+        timed("CartRenderer, changed rows only", lambda: renderer.update(items))
+
+
+def _redirected(items: list[Item], sink) -> None:
+    with contextlib.redirect_stdout(sink):
+        print_rows(items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark memory per cart line and total throughput for each way of storing items."""
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Sized
+
+from design_challenge.columnar import ColumnarItems
+from design_challenge.day8.after_tomaluuk import Item
+from design_challenge.money import Money, total_price
+
+LINES = 10**6
+
+
+@dataclass
+class DictItem:
+    """An item as it was before: a regular dataclass with a per-instance __dict__."""
+
+    name: str
+    price: Decimal
+    quantity: int
+
+
+def measure(label: str, build: Callable[[], Sized]) -> None:
+    tracemalloc.start()
+    items = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    total_price(items)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{allocated / len(items):>10.1f} B{len(items) / elapsed / 1e6:>12.2f} M/s")
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # Names are shared by every variant, so they are created outside the measurements.
+    names = [f"item-{i}" for i in range(LINES)]
+    cents = [rng.randrange(1, 10**5) for _ in range(LINES)]
+    quantities = [rng.randint(1, 10) for _ in range(LINES)]
+    lines = list(zip(names, cents, quantities))
+
+    print(f"{LINES} lines{'memory/line':>31}{'total':>14}")
+    measure(
+        "dataclass, Decimal price",
+        lambda: [DictItem(name, Decimal(c).scaleb(-2), q) for name, c, q in lines],
+    )
+    measure(
+        "slotted Item, Decimal price",
+        lambda: [Item(name, Decimal(c).scaleb(-2), q) for name, c, q in lines],
+    )
+    measure("slotted Item, Money price", lambda: [Item(name, Money(c), q) for name, c, q in lines])
+    measure(
+        "ColumnarItems",
+        lambda: ColumnarItems(Item(name, Money(c), q) for name, c, q in lines),
+    )
+
+
+if __name__ == "__main__":
+    main()
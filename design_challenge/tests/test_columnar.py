@@ -0,0 +1,137 @@
+"""Tests for the columnar item store and slotted items."""
+from design_challenge import rendering
+from design_challenge.columnar import ColumnarItems, ItemView
+from design_challenge.day5.after_tomaluuk import Item as PlainItem
+from design_challenge.day6.after_tomaluuk import Item as CartItem
+from design_challenge.day6.after_tomaluuk import InvalidQuantityException
+from design_challenge.day6.after_tomaluuk import ShoppingCart as IndexedCart
+from design_challenge.day7.after_tomaluuk import Item as CodeItem
+from design_challenge.day7.after_tomaluuk import ShoppingCart as CodeCart
+from design_challenge.day8.after_tomaluuk import Item as DiscountItem
+from design_challenge.day8.after_tomaluuk import ShoppingCart as DiscountCart
+from design_challenge.money import InexactMoneyException, Money, total_price
+from decimal import Decimal
+import io
+import random
+import pytest
+
+
+def random_items(size: int, seed: int = 0) -> list[DiscountItem]:
+    rng = random.Random(seed)
+    return [
+        DiscountItem(f"item-{i}", Decimal(rng.randrange(1, 10**5)) / 100, rng.randint(1, 50))
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("item_class", [PlainItem, CartItem, CodeItem, DiscountItem])
+def test_items_are_slotted(item_class):
+    assert not hasattr(item_class("Apple", Decimal("1.50"), 10), "__dict__")
+
+
+def test_views_read_and_write_like_items():
+    store = ColumnarItems([DiscountItem("Apple", Decimal("1.50"), 10)])
+    view = store[0]
+    assert isinstance(view, ItemView)
+    assert (view.name, view.price, view.quantity) == ("Apple", Money(150), 10)
+    assert view == DiscountItem("Apple", Decimal("1.50"), 10)
+    assert view.subtotal == Decimal("15.00")
+
+    view.quantity = 3
+    view.price = Decimal("2.25")
+    assert store[-1] == DiscountItem("Apple", Decimal("2.25"), 3)
+    with pytest.raises(IndexError):
+        store[1]
+
+
+def test_total_price_matches_items():
+    items = random_items(1000)
+    store = ColumnarItems(items)
+    assert store.total_price() == total_price(items)
+    assert total_price(store) == total_price(items)
+    assert total_price(ColumnarItems()) == 0
+
+
+def test_inexact_price_is_rejected():
+    with pytest.raises(InexactMoneyException):
+        ColumnarItems([DiscountItem("Apple", Decimal("1.505"), 1)])
+
+
+def test_discount_cart_on_columnar_store():
+    items = random_items(50)
+    # Views price in Money, which rounds percentage discounts to the cent.
+    money_items = [
+        DiscountItem(item.name, Money.from_decimal(item.price), item.quantity) for item in items
+    ]
+    cart = DiscountCart(items=money_items)
+    columnar = DiscountCart(items=ColumnarItems(items))
+    for code in ("SAVE10", "5BUCKSOFF"):
+        cart.apply_discount(code)
+        columnar.apply_discount(code)
+
+    assert columnar.total == cart.total
+    for name in ("item-3", "item-40"):
+        assert columnar.find_item(name) == cart.find_item(name)
+        cart.remove_item(name)
+        columnar.remove_item(name)
+    columnar.add_item(DiscountItem("Extra", Decimal("3.00"), 2))
+    cart.add_item(DiscountItem("Extra", Decimal("3.00"), 2))
+
+    assert len(columnar.items) == len(cart.items) == 49
+    assert columnar.subtotal == cart.subtotal
+    expected, output = io.StringIO(), io.StringIO()
+    cart.display(expected)
+    columnar.display(output)
+    assert output.getvalue() == expected.getvalue()
+
+
+def test_code_cart_on_columnar_store():
+    items = [CodeItem(item.name, item.price, item.quantity) for item in random_items(20)]
+    cart = CodeCart(items=ColumnarItems(items), discount_code="SAVE10")
+    assert cart.subtotal == total_price(items)
+    assert cart.find_item("item-5") == items[5]
+
+
+def test_indexed_cart_on_columnar_store():
+    items = [CartItem(item.name, item.price, item.quantity) for item in random_items(20)]
+    store = ColumnarItems(items)
+    cart = IndexedCart(store)
+    assert cart.total == total_price(items)
+
+    cart.update_item("item-4", quantity=7, price=Decimal("2.50"))
+    assert store[4] == CartItem("item-4", Decimal("2.50"), 7)
+    with pytest.raises(InvalidQuantityException):
+        cart.update_item("item-4", quantity=0)
+    cart.remove_item("item-2")
+    cart.add_item(CartItem("Extra", Decimal("3.00"), 2))
+    assert cart.total == total_price(cart.items)
+    assert str(cart).count("\n") == len(cart.items) + 4
+
+
+def test_views_are_stable_per_row():
+    store = ColumnarItems(random_items(5))
+    view = store[3]
+    assert store[3] is view and list(store)[3] is view
+    assert view.price is view.price
+    store.remove(store[1])
+    assert store[2] is view
+    assert view.name == "item-3"
+
+
+def test_renderer_reuses_unchanged_columnar_rows(monkeypatch):
+    store = ColumnarItems(random_items(10))
+    renderer = rendering.CartRenderer()
+    renderer.update(store)
+    formatted = []
+    monkeypatch.setattr(
+        rendering, "format_row", lambda item: formatted.append(item) or f"{item.name}"
+    )
+    store[4].quantity = 2
+    renderer.update(store)
+    assert formatted == [store[4]]
+
+
+def test_remove_missing_row():
+    store = ColumnarItems(random_items(3))
+    with pytest.raises(ValueError):
+        store.remove(DiscountItem("item-0", Decimal("0.01"), 1))
@@ -0,0 +1,88 @@
+"""Tests for the fixed-point Money type."""
+from design_challenge.day3.after.bank import Account, AccountType
+from design_challenge.day3.after.events import NULL_SINK
+from design_challenge.day6.after_tomaluuk import Item, ShoppingCart
+from design_challenge.day8.after_tomaluuk import Item as DiscountItem
+from design_challenge.day8.after_tomaluuk import ShoppingCart as DiscountCart
+from design_challenge.money import InexactMoneyException, Money, total_price
+from decimal import ROUND_HALF_UP, Decimal
+import random
+import pytest
+
+
+def random_cart_lines(size: int, seed: int) -> list[tuple[str, Decimal, int]]:
+    """A helper function generating random cart lines with whole-cent prices."""
+    rng = random.Random(seed)
+    return [
+        (f"item-{i}", Decimal(rng.randrange(1, 10**6)) / 100, rng.randint(1, 1000))
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("size", [10, 1000, 10**5])
+def test_totals_identical_to_the_cent(size):
+    lines = random_cart_lines(size, seed=size)
+    decimal_cart = ShoppingCart([Item(name, price, quantity) for name, price, quantity in lines])
+    money_cart = ShoppingCart(
+        [Item(name, Money.from_decimal(price), quantity) for name, price, quantity in lines]
+    )
+    assert isinstance(money_cart.total, Money)
+    assert money_cart.total.to_decimal() == decimal_cart.total
+    assert f"{money_cart.total:.2f}" == f"{decimal_cart.total:.2f}"
+
+
+def test_subtotal_and_display_match():
+    decimal_item = Item("Pizza", Decimal("11.90"), 5)
+    money_item = Item("Pizza", Money.from_decimal("11.90"), 5)
+    assert money_item.subtotal == decimal_item.subtotal
+    assert str(ShoppingCart([money_item])) == str(ShoppingCart([decimal_item]))
+
+
+def test_discounted_totals_match():
+    lines = random_cart_lines(100, seed=1)
+    decimal_cart = DiscountCart([DiscountItem(*line) for line in lines])
+    money_cart = DiscountCart(
+        [DiscountItem(name, Money.from_decimal(price), qty) for name, price, qty in lines]
+    )
+    for cart in (decimal_cart, money_cart):
+        cart.apply_discount("SAVE10")
+        cart.apply_discount("5BUCKSOFF")
+    rounded = decimal_cart.total.quantize(Decimal("0.01"))
+    assert money_cart.total.to_decimal() == rounded
+
+
+def test_conversion_is_exact_or_explicitly_rounded():
+    assert Money.from_decimal(Decimal("19.99")).cents == 1999
+    assert Money.from_decimal(Decimal("-0.5")).to_decimal() == Decimal("-0.50")
+    with pytest.raises(InexactMoneyException):
+        Money.from_decimal(Decimal("0.125"))
+    assert Money.from_decimal(Decimal("0.125"), ROUND_HALF_UP).cents == 13
+    assert Money(1250) * Decimal("0.1") == Money(125)
+    assert Money(1) * Decimal("0.5") == Money(0)  # half to even
+
+
+def test_ordering_matches_equality():
+    sub_cent = Decimal("0.055")
+    assert Money(5) != sub_cent
+    assert Money(5) < sub_cent
+    assert Money(5) <= sub_cent
+    assert not Money(5) > sub_cent
+    assert Money(6) >= sub_cent
+    assert Money(500) >= 5
+    assert Money(1) > Money(0)
+    with pytest.raises(TypeError):
+        Money(5) < 0.05
+
+
+def test_account_balance_arithmetic():
+    account = Account("SA001", Money.from_decimal("1000"), AccountType.SAVINGS, NULL_SINK)
+    account.deposit(Money.from_decimal("0.10"))
+    account.deposit(Decimal("0.20"))
+    account.withdraw(Money(5))
+    assert account.balance == Money(100025)
+    assert account.balance == Decimal("1000.25")
+
+
+def test_empty_cart_total():
+    assert total_price([]) == Decimal(0)
+    assert ShoppingCart().total == 0
@@ -0,0 +1,103 @@
+"""Tests for rendering carts as text tables."""
+from design_challenge.day6.after_tomaluuk import Item, ShoppingCart
+from design_challenge.day8.after_tomaluuk import Item as DiscountItem
+from design_challenge.day8.after_tomaluuk import ShoppingCart as DiscountCart
+from design_challenge.rendering import CartRenderer, format_row, write_lines, write_table
+from decimal import Decimal
+import contextlib
+import io
+
+
+def printed_table(items) -> str:
+    """The table as carts used to print it, one print per line."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print("Shopping Cart:")
+        print(f"{'Item':<10}{'Price':>10}{'Qty':>7}{'Total':>13}")
+        for item in items:
+            print(
+                f"{item.name:<12}${item.price:>7.2f}{item.quantity:>7}     ${item.subtotal:>7.2f}"
+            )
+        print("=" * 40)
+    return output.getvalue()
+
+
+def create_items(count: int) -> list[Item]:
+    return [Item(f"Item {i}", Decimal(i % 100 + 1) / 4, i % 9 + 1) for i in range(count)]
+
+
+class CountingSink(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def test_write_table_matches_printed_table():
+    items = create_items(10_000)
+    output = io.StringIO()
+    write_table(items, output)
+    assert output.getvalue() == printed_table(items)
+
+
+def test_write_lines_writes_in_chunks():
+    sink = CountingSink()
+    write_lines((str(i) for i in range(10)), sink, lines_per_write=4)
+    assert sink.getvalue() == "".join(f"{i}\n" for i in range(10))
+    assert sink.writes == 3
+
+
+def test_day6_cart_str():
+    cart = ShoppingCart([Item("Apple", Decimal("1.5"), 10), Item("Pizza", Decimal("3.50"), 5)])
+    assert str(cart) == (
+        "Shopping Cart:\n"
+        "Item           Price    Qty        Total\n"
+        "Apple       $   1.50     10     $  15.00\n"
+        "Pizza       $   3.50      5     $  17.50\n"
+        f"{'=' * 40}\n"
+        "Total: $  32.50\n"
+    )
+    assert cart._get_items_str == "\n" + "\n".join(format_row(item) for item in cart.items)
+
+
+def test_display_writes_to_any_sink():
+    cart = DiscountCart([DiscountItem("Apple", Decimal("1.50"), 10)])
+    cart.apply_discount("SAVE10")
+    output = io.StringIO()
+    cart.display(output)
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        cart.display()
+    assert output.getvalue() == printed.getvalue()
+    assert output.getvalue() == (
+        printed_table(cart.items) + "Subtotal: $  15.00\nDiscount: $   1.50\nTotal:    $  13.50\n"
+    )
+
+
+def test_renderer_reports_only_changed_rows():
+    items = create_items(100)
+    renderer = CartRenderer()
+    assert len(renderer.update(items)) == 100
+
+    assert renderer.update(items) == []
+    items[3].set_quantity(50)
+    items[70].set_price(Decimal("9.99"))
+    assert renderer.update(items) == [(3, format_row(items[3])), (70, format_row(items[70]))]
+
+    del items[10]
+    changed = renderer.update(items)
+    assert [position for position, _ in changed] == list(range(10, 99))
+    assert renderer.lines == [format_row(item) for item in items]
+
+
+def test_renderer_write_matches_printed_table():
+    items = create_items(50)
+    renderer = CartRenderer()
+    renderer.write(items, io.StringIO())
+    items[0].set_quantity(7)
+    output = io.StringIO()
+    renderer.write(items, output)
+    assert output.getvalue() == printed_table(items)